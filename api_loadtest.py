@@ -0,0 +1,243 @@
+import numpy as np
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlsplit
+import logging
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REQUEST_MIX = {
+    'kpis': 0.35,
+    'breakdown': 0.2,
+    'segments': 0.05,
+    'salary': 0.1,
+    'predict': 0.25,
+    'predict_batch': 0.05
+}
+
+
+class Connection:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None, headers=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        payload = b'' if body is None else json.dumps(body).encode()
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                f"Content-Length: {len(payload)}"]
+        if body is not None:
+            head.append("Content-Type: application/json")
+        head.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+        await self.writer.drain()
+
+        lines = (await self.reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ')[1])
+        response_headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                response_headers[name.strip().lower()] = value.strip()
+        response_body = await self.reader.readexactly(int(response_headers.get('content-length', 0)))
+        if response_headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, response_headers, response_body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = None
+        self.writer = None
+
+
+async def _levels(connection, dim):
+    status, _, body = await connection.request('GET', f"/breakdown/{dim}")
+    if status != 200:
+        raise RuntimeError(f"Could not read {dim} levels: HTTP {status}")
+    return [row[dim] for row in json.loads(body)['result']]
+
+
+def _employee(rng, levels):
+    return {
+        'age': int(rng.integers(22, 60)),
+        'gender': str(rng.choice(levels['gender'])),
+        'department': str(rng.choice(levels['department'])),
+        'experience_years': int(rng.integers(0, 30)),
+        'salary': int(rng.integers(40_000, 150_000)),
+        'technical_background': str(rng.choice(levels['technical_background'])),
+        'performance_rating': int(rng.integers(1, 6)),
+        'work_life_balance': int(rng.integers(1, 5))
+    }
+
+
+def build_plan(n_requests, levels, mix=None, seed=42):
+    rng = np.random.default_rng(seed)
+    mix = mix or REQUEST_MIX
+    kinds = rng.choice(list(mix), size=n_requests, p=np.array(list(mix.values())) / sum(mix.values()))
+    departments = levels['department']
+
+    plan = []
+    for kind in kinds:
+        if kind == 'kpis':
+            selected = sorted(rng.choice(departments, size=rng.integers(1, 4), replace=False))
+            low = int(rng.choice([25, 30, 35]))
+            query = {'department': ','.join(selected), 'age': f"{low}..{low + 20}"}
+            plan.append((kind, 'GET', f"/kpis?{urlencode(query)}", None))
+        elif kind == 'breakdown':
+            dim = str(rng.choice(['department', 'gender', 'performance_rating', 'work_life_balance']))
+            plan.append((kind, 'GET', f"/breakdown/{dim}?gender={rng.choice(levels['gender'])}", None))
+        elif kind == 'segments':
+            plan.append((kind, 'GET', f"/segments?min_support={rng.choice([10, 20, 50])}", None))
+        elif kind == 'salary':
+            low = int(rng.integers(4, 10)) * 10_000
+            plan.append((kind, 'GET', f"/salary/range?low={low}&high={low + 20_000}", None))
+        elif kind == 'predict':
+            plan.append((kind, 'POST', '/predict', _employee(rng, levels)))
+        else:
+            employees = [_employee(rng, levels) for _ in range(100)]
+            plan.append((kind, 'POST', '/predict/batch', {'employees': employees}))
+    return plan
+
+
+async def _client(host, port, plan, position, latencies, statuses, etags):
+    connection = Connection(host, port)
+    try:
+        while position[0] < len(plan):
+            kind, method, path, body = plan[position[0]]
+            position[0] += 1
+            headers = {'If-None-Match': etags[path]} if path in etags else None
+
+            start = time.perf_counter()
+            status, response_headers, _ = await connection.request(method, path, body, headers)
+            latencies[kind].append(time.perf_counter() - start)
+            statuses[status] += 1
+            if 'etag' in response_headers:
+                etags[path] = response_headers['etag']
+    finally:
+        connection.close()
+
+
+async def run_load_test(host, port, n_requests=2000, concurrency=32, mix=None, seed=42):
+    setup = Connection(host, port)
+    try:
+        levels = {dim: await _levels(setup, dim) for dim in ['department', 'gender', 'technical_background']}
+    finally:
+        setup.close()
+
+    plan = build_plan(n_requests, levels, mix, seed)
+    latencies = defaultdict(list)
+    statuses = Counter()
+    etags = {}
+    position = [0]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, plan, position, latencies, statuses, etags) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    health = Connection(host, port)
+    try:
+        _, _, body = await health.request('GET', '/health')
+    finally:
+        health.close()
+
+    return {
+        'requests': n_requests,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(n_requests / elapsed, 1),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'latency_ms': {
+            kind: {
+                'count': len(values),
+                'p50': round(float(np.percentile(values, 50)) * 1000, 2),
+                'p95': round(float(np.percentile(values, 95)) * 1000, 2),
+                'p99': round(float(np.percentile(values, 99)) * 1000, 2)
+            }
+            for kind, values in sorted(latencies.items())
+        },
+        'server': json.loads(body)
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind((config.API_HOST, 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_ready(host, port, server, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API server exited with code {server.returncode}")
+        connection = Connection(host, port)
+        try:
+            status, _, _ = await connection.request('GET', '/health')
+            if status == 200:
+                return
+        except OSError:
+            pass
+        finally:
+            connection.close()
+        await asyncio.sleep(0.5)
+    raise TimeoutError(f"API server did not start within {timeout}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the HR analytics HTTP API")
+    parser.add_argument('--url', help="running API to test (default: start a local server)")
+    parser.add_argument('--data', default=config.DATA_PATH, help="source CSV for the local server")
+    parser.add_argument('--workers', type=int, help="worker processes for the local server")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--startup-timeout', type=float, default=120)
+    parser.add_argument('--output', help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = config.API_HOST, _free_port()
+        command = [sys.executable, 'api_server.py', '--data', args.data, '--host', host, '--port', str(port)]
+        if args.workers:
+            command.extend(['--workers', str(args.workers)])
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        if server is not None:
+            asyncio.run(_wait_until_ready(host, port, server, args.startup_timeout))
+        results = asyncio.run(run_load_test(host, port, args.requests, args.concurrency, seed=args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(output)
+        logger.info(f"Load test results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,570 @@
+import pandas as pd
+import numpy as np
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import signal
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+import logging
+import config
+from attrition_cube import CUBE_DIMENSIONS
+from data_processor import DataProcessor
+from model_registry import ModelRegistry
+from predictive_analytics import FEATURE_COLUMNS, AttritionPredictor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FILTER_DIMENSIONS = [dim for dim in CUBE_DIMENSIONS if dim != 'salary_bin']
+
+_worker_processor = None
+_worker_predictors = {}
+
+
+def _init_worker(data_path, compact):
+    global _worker_processor
+    _worker_processor = DataProcessor(data_path, compact=compact, shared=True)
+    _worker_processor.load_data()
+
+
+def _plain(value):
+    if isinstance(value, pd.DataFrame):
+        if any(name is not None for name in value.index.names):
+            value = value.reset_index()
+        return json.loads(value.to_json(orient='records', date_format='iso'))
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray, pd.Index)):
+        return [_plain(item) for item in value]
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _query(filters):
+    levels = _worker_processor.get_cube().levels
+    selection = {}
+    for dim, values in filters.items():
+        if isinstance(values, tuple) or not pd.api.types.is_numeric_dtype(levels[dim]):
+            selection[dim] = values
+        else:
+            selection[dim] = list(pd.to_numeric(pd.Index(values), errors='coerce'))
+    return _worker_processor.query(selection)
+
+
+def _predictor(model_key):
+    predictor = _worker_predictors.get(model_key)
+    if predictor is None:
+        predictor = AttritionPredictor.from_registry(model_key)
+        predictor.model.set_params(n_jobs=1)
+        _worker_predictors.clear()
+        _worker_predictors[model_key] = predictor
+    return predictor
+
+
+def _score_frame(predictor, frame):
+    results = predictor.predict_batch(frame)
+    return [
+        {'prediction': prediction, 'probability': float(probability), 'risk_band': str(band)}
+        for prediction, probability, band in zip(
+            results['prediction'], results['probability'], results['risk_band']
+        )
+    ]
+
+
+def _score(model_key, records):
+    predictor = _predictor(model_key)
+    try:
+        return _score_frame(predictor, pd.DataFrame.from_records(records))
+    except (KeyError, TypeError, ValueError):
+        pass
+
+    scored = []
+    for record in records:
+        try:
+            scored.extend(_score_frame(predictor, pd.DataFrame([record])))
+        except (KeyError, TypeError, ValueError) as e:
+            scored.append({'error': str(e)})
+    return scored
+
+
+def _train():
+    registry = ModelRegistry()
+    predictor = AttritionPredictor.load_or_train(_worker_processor.df, registry)
+    return predictor.registry_key(registry)
+
+
+_OPERATIONS = {
+    'ping': lambda: os.getpid(),
+    'kpis': lambda filters: _query(filters).stats,
+    'breakdown': lambda dim, filters: _query(filters).cube.breakdown(dim),
+    'segments': lambda orders, min_support, top: _worker_processor.get_attrition_segments(orders, min_support, top),
+    'salary_bands': lambda edges: _worker_processor.get_salary_bands(edges),
+    'salary_range': lambda low, high: _worker_processor.get_salary_range_attrition(low, high),
+    'train': _train,
+    'score': _score
+}
+
+
+def _execute(generation, operation, *args):
+    if _worker_processor.data_version != generation:
+        _worker_processor.sync_shared()
+    return _worker_processor.data_version, _plain(_OPERATIONS[operation](*args))
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+
+
+def response_etag(generation, path, query):
+    key = f"{generation}|{path}|{json.dumps(sorted(query.items()))}"
+    return f'"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def _etag_matches(header, etag):
+    if header is None:
+        return False
+    candidates = [candidate.strip().removeprefix('W/') for candidate in header.split(',')]
+    return '*' in candidates or etag in candidates
+
+
+def _check_params(query, allowed):
+    unknown = sorted(set(query) - set(allowed))
+    if unknown:
+        raise HTTPError(400, f"Unknown query parameters: {unknown}; expected any of {sorted(allowed)}")
+
+
+def _numbers(query, name, cast, default=None):
+    if name not in query:
+        return default
+    try:
+        return [cast(value) for value in query[name].split(',') if value.strip()]
+    except ValueError:
+        raise HTTPError(400, f"Query parameter {name} must be a comma-separated list of numbers")
+
+
+def _number(query, name, cast, default=None):
+    values = _numbers(query, name, cast)
+    if values is None:
+        return default
+    if len(values) != 1:
+        raise HTTPError(400, f"Query parameter {name} must be a single number")
+    return values[0]
+
+
+def parse_filters(query):
+    filters = {}
+    for dim in FILTER_DIMENSIONS:
+        if dim not in query:
+            continue
+        value = query[dim]
+        if '..' in value:
+            low, _, high = value.partition('..')
+            try:
+                filters[dim] = (float(low), float(high))
+            except ValueError:
+                raise HTTPError(400, f"Range filter {dim} must look like low..high")
+        else:
+            filters[dim] = sorted(item for item in value.split(',') if item)
+    return filters
+
+
+def _read_json(body):
+    try:
+        return json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HTTPError(400, f"Request body is not valid JSON: {e}")
+
+
+def _check_employee(record):
+    if not isinstance(record, dict):
+        raise HTTPError(400, "Each employee must be a JSON object")
+    missing = [col for col in FEATURE_COLUMNS if col not in record]
+    if missing:
+        raise HTTPError(400, f"Employee is missing fields: {missing}")
+    return record
+
+
+class ResponseCache:
+    def __init__(self, maxsize=config.API_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class PredictionBatcher:
+    def __init__(self, submit, window_seconds, max_size, max_in_flight):
+        self.submit = submit
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self.max_in_flight = max_in_flight
+        self.batches = 0
+        self.scored = 0
+        self._pending = []
+        self._in_flight = 0
+        self._timer = None
+
+    async def score(self, record):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((record, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending and self._in_flight < self.max_in_flight:
+            batch, self._pending = self._pending[:self.max_size], self._pending[self.max_size:]
+            self._in_flight += 1
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        self.batches += 1
+        self.scored += len(batch)
+        try:
+            results = await self.submit([record for record, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            self._flush()
+
+
+class AnalyticsAPI:
+    def __init__(self, processor, n_workers=config.API_WORKERS, cache_size=config.API_CACHE_SIZE,
+                 batch_window_ms=config.API_BATCH_WINDOW_MS, batch_max_size=config.API_BATCH_MAX_SIZE):
+        self.processor = processor
+        self.n_workers = n_workers or os.cpu_count()
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(processor.data_path, processor.compact)
+        )
+        self.cache = ResponseCache(cache_size)
+        self._rendering = {}
+        self.batcher = PredictionBatcher(self._score, batch_window_ms / 1000, batch_max_size, self.n_workers)
+        self.model_key = None
+        self.model_version = None
+        self.requests = 0
+        self.started_at = time.time()
+        self._model_lock = asyncio.Lock()
+        self._cached_routes = {
+            '/kpis': self._kpis,
+            '/segments': self._segments,
+            '/salary/bands': self._salary_bands,
+            '/salary/range': self._salary_range
+        }
+        self._post_routes = {
+            '/predict': self._predict,
+            '/predict/batch': self._predict_batch
+        }
+
+    async def _run(self, operation, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.pool, functools.partial(_execute, self.processor.data_version, operation, *args)
+        )
+
+    async def _ensure_model(self):
+        async with self._model_lock:
+            generation = self.processor.data_version
+            if self.model_version != generation:
+                start = time.perf_counter()
+                _, self.model_key = await self._run('train')
+                self.model_version = generation
+                logger.info(f"Model {self.model_key} ready for data version {generation} "
+                            f"in {time.perf_counter() - start:.1f}s")
+        return self.model_key
+
+    async def _score(self, records):
+        model_key = await self._ensure_model()
+        chunk_size = max(self.batcher.max_size, -(-len(records) // self.n_workers))
+        chunks = await asyncio.gather(*(
+            self._run('score', model_key, records[offset:offset + chunk_size])
+            for offset in range(0, len(records), chunk_size)
+        ))
+        return [result for _, chunk in chunks for result in chunk]
+
+    async def _kpis(self, query):
+        _check_params(query, FILTER_DIMENSIONS)
+        return await self._run('kpis', parse_filters(query))
+
+    async def _breakdown(self, query, dim):
+        _check_params(query, FILTER_DIMENSIONS)
+        return await self._run('breakdown', dim, parse_filters(query))
+
+    async def _segments(self, query):
+        _check_params(query, ['orders', 'min_support', 'top'])
+        orders = tuple(sorted(set(_numbers(query, 'orders', int, [2, 3]))))
+        if not orders or any(order < 1 for order in orders):
+            raise HTTPError(400, "orders must be positive integers")
+        min_support = _number(query, 'min_support', int, config.CROSSTAB_MIN_SUPPORT)
+        top = _number(query, 'top', int, config.CROSSTAB_TOP_SEGMENTS)
+        return await self._run('segments', orders, min_support, top)
+
+    async def _salary_bands(self, query):
+        _check_params(query, ['edges'])
+        return await self._run('salary_bands', _numbers(query, 'edges', float))
+
+    async def _salary_range(self, query):
+        _check_params(query, ['low', 'high'])
+        return await self._run('salary_range', _number(query, 'low', float), _number(query, 'high', float))
+
+    async def _predict(self, body):
+        result = await self.batcher.score(_check_employee(_read_json(body)))
+        if 'error' in result:
+            raise HTTPError(422, result['error'])
+        return {'model': self.model_key, 'prediction': result}
+
+    async def _predict_batch(self, body):
+        payload = _read_json(body)
+        records = payload.get('employees') if isinstance(payload, dict) else payload
+        if not isinstance(records, list):
+            raise HTTPError(400, "Expected a JSON list of employees or an object with an 'employees' list")
+        predictions = await self._score([_check_employee(record) for record in records]) if records else []
+        return {'model': self.model_key, 'predictions': predictions}
+
+    def _health(self):
+        return {
+            'status': 'ok',
+            'data_version': self.processor.data_version,
+            'rows': len(self.processor.df),
+            'model': self.model_key,
+            'workers': self.n_workers,
+            'requests': self.requests,
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'cache': {'entries': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses},
+            'batching': {'batches': self.batcher.batches, 'scored': self.batcher.scored}
+        }
+
+    async def _cached(self, handler, path, query, headers, *args):
+        generation = self.processor.data_version
+        etag = response_etag(generation, path, query)
+        response_headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if _etag_matches(headers.get('if-none-match'), etag):
+            return HTTPStatus.NOT_MODIFIED, b'', response_headers
+
+        body = self.cache.get(etag)
+        if body is None:
+            task = self._rendering.get(etag)
+            if task is None:
+                task = asyncio.ensure_future(self._render(handler, generation, etag, query, args))
+                self._rendering[etag] = task
+                task.add_done_callback(lambda _: self._rendering.pop(etag, None))
+            data_version, body = await task
+            if data_version != generation:
+                response_headers['ETag'] = response_etag(data_version, path, query)
+        return HTTPStatus.OK, body, response_headers
+
+    async def _render(self, handler, generation, etag, query, args):
+        data_version, result = await handler(query, *args)
+        body = json.dumps({'data_version': data_version, 'result': result}).encode()
+        if data_version == generation:
+            self.cache.put(etag, body)
+        return data_version, body
+
+    async def dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        query = dict(parse_qsl(url.query, keep_blank_values=True))
+
+        if path == '/health':
+            if method != 'GET':
+                raise HTTPError(405)
+            return HTTPStatus.OK, json.dumps(self._health()).encode(), {}
+
+        if path in self._cached_routes or path.startswith('/breakdown/'):
+            if method != 'GET':
+                raise HTTPError(405)
+            if path in self._cached_routes:
+                return await self._cached(self._cached_routes[path], path, query, headers)
+            dim = path.removeprefix('/breakdown/')
+            if dim not in FILTER_DIMENSIONS:
+                raise HTTPError(404, f"Unknown breakdown dimension {dim}; expected one of {FILTER_DIMENSIONS}")
+            return await self._cached(self._breakdown, path, query, headers, dim)
+
+        if path in self._post_routes:
+            if method != 'POST':
+                raise HTTPError(405)
+            return HTTPStatus.OK, json.dumps(await self._post_routes[path](body)).encode(), {}
+
+        raise HTTPError(404, f"No route for {path}")
+
+    async def _respond(self, writer, status, body, headers, keep_alive):
+        status = HTTPStatus(status)
+        head = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        headers = {
+            'Content-Type': 'application/json',
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+            **headers
+        }
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, target, version, headers, body = request
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+                    self.requests += 1
+                    status, payload, response_headers = await self.dispatch(method, target, headers, body)
+                except HTTPError as e:
+                    status, payload, response_headers = e.status, json.dumps({'error': str(e)}).encode(), {}
+                except Exception as e:
+                    logger.exception(f"Request failed: {e}")
+                    status, payload, response_headers = 500, json.dumps({'error': str(e)}).encode(), {}
+                await self._respond(writer, status, payload, response_headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _refresh_loop(self, interval):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                changed = await loop.run_in_executor(None, self.processor.refresh)
+            except Exception as e:
+                logger.warning(f"Dataset refresh failed: {str(e)}")
+                continue
+            if changed:
+                self.cache.clear()
+                logger.info(f"Dataset refreshed to data version {self.processor.data_version}")
+                await self._ensure_model()
+
+    async def serve(self, host=config.API_HOST, port=config.API_PORT, refresh_seconds=config.API_REFRESH_SECONDS):
+        await asyncio.gather(*(self._run('ping') for _ in range(self.n_workers)))
+        await self._ensure_model()
+
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, server.close)
+
+        refresher = asyncio.create_task(self._refresh_loop(refresh_seconds))
+        logger.info(f"Serving HR analytics API on http://{host}:{port} with {self.n_workers} workers")
+        try:
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            logger.info("Shutting down")
+        finally:
+            refresher.cancel()
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def _read_request(reader):
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431)
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > config.API_MAX_BODY_BYTES:
+        raise HTTPError(413)
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, version, headers, body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve HR analytics aggregates and attrition scoring over HTTP")
+    parser.add_argument('--data', default=config.DATA_PATH, help="source CSV file")
+    parser.add_argument('--host', default=config.API_HOST)
+    parser.add_argument('--port', type=int, default=config.API_PORT)
+    parser.add_argument('--workers', type=int, default=config.API_WORKERS,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument('--refresh-seconds', type=float, default=config.API_REFRESH_SECONDS,
+                        help="how often to check the source file for changes")
+    args = parser.parse_args(argv)
+
+    processor = DataProcessor(args.data, compact=config.COMPACT_FRAME, shared=True)
+    if processor.load_data() is None:
+        raise SystemExit(f"Could not load {args.data}")
+
+    api = AnalyticsAPI(processor, args.workers)
+    try:
+        asyncio.run(api.serve(args.host, args.port, args.refresh_seconds))
+    finally:
+        api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from data_processor import DataProcessor
 from predictive_analytics import AttritionPredictor
+from model_tuning import start_tuning_job
+from figure_cache import shared_figure_cache
+from tracing import start_trace, stop_trace, trace_stage
 import config
 
 st.set_page_config(
@@ -14,25 +17,178 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-@st.cache_data
+@st.cache_resource
 def load_data():
-    processor = DataProcessor(config.DATA_PATH)
+    processor = DataProcessor(config.DATA_PATH, compact=config.COMPACT_FRAME, shared=config.SHARED_DATASET)
     df = processor.load_data()
     processor.validate_data()
+    processor.get_cube()
+    processor.get_salary_index()
     return processor, df
 
+@st.cache_resource(max_entries=1)
+def load_predictor(data_version):
+    processor, _ = load_data()
+    return AttritionPredictor(processor.df)
+
+def format_rate(table, key):
+    if key not in table.index:
+        return "n/a"
+    return f"{table.loc[key, 'attrition_rate']:.1f}%"
+
+def department_figure(dept_attrition):
+    fig = px.bar(
+        dept_attrition.reset_index(),
+        x='attrition_rate',
+        y='department',
+        orientation='h',
+        labels={'attrition_rate': 'Attrition Rate (%)', 'department': 'Department'},
+        color='attrition_rate',
+        color_continuous_scale='Reds'
+    )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+def gender_figure(gender_attrition):
+    fig = px.bar(
+        gender_attrition.reset_index(),
+        x='gender',
+        y='attrition_rate',
+        labels={'attrition_rate': 'Attrition Rate (%)', 'gender': 'Gender'},
+        color='gender',
+        color_discrete_map={'Male': '#66b3ff', 'Female': '#ff9999'}
+    )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+def technical_figure(tech_attrition):
+    fig = px.bar(
+        tech_attrition.reset_index(),
+        x='technical_background',
+        y='attrition_rate',
+        labels={'attrition_rate': 'Attrition Rate (%)', 'technical_background': 'Technical Background'},
+        color='technical_background',
+        color_discrete_map={'Yes': '#66b3ff', 'No': '#ff9999'}
+    )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+def salary_band_figure(bands):
+    fig = px.bar(
+        bands.reset_index(),
+        x='salary_range',
+        y='attrition_rate',
+        labels={'attrition_rate': 'Attrition Rate (%)', 'salary_range': 'Salary Range'},
+        color='attrition_rate',
+        color_continuous_scale='Reds',
+        hover_data=['total_employees', 'avg_salary_in_range']
+    )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+def parse_band_edges(text):
+    try:
+        return sorted({float(value) for value in text.replace(',', ' ').split()})
+    except ValueError:
+        return None
+
+def histogram_figure(counts, edges, label, color, mean=None):
+    fig = px.bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        labels={'x': label, 'y': 'Number of Employees'},
+        color_discrete_sequence=[color]
+    )
+    fig.update_traces(width=edges[1] - edges[0])
+    if mean is not None:
+        fig.add_vline(
+            x=mean,
+            line_dash="dash",
+            line_color="red",
+            annotation_text=f"Mean: ${mean:,.0f}"
+        )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+def performance_figure(perf_dist):
+    fig = px.bar(
+        x=perf_dist.index,
+        y=perf_dist.values,
+        labels={'x': 'Performance Rating', 'y': 'Number of Employees'},
+        color_discrete_sequence=[config.COLORS['info']]
+    )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+def importance_figure(feature_importance):
+    fig = px.bar(
+        feature_importance,
+        x='importance',
+        y='feature',
+        orientation='h',
+        labels={'importance': 'Importance Score', 'feature': 'Feature'},
+        color='importance',
+        color_continuous_scale='Blues'
+    )
+    fig.update_layout(height=300, showlegend=False)
+    return fig
+
+def trend_figure(series):
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(
+        go.Scatter(x=series.index, y=series['headcount'], name='Headcount',
+                   line=dict(color=config.COLORS['primary'])),
+        secondary_y=False
+    )
+    fig.add_trace(
+        go.Scatter(x=series.index, y=series['rolling_attrition_rate'],
+                   name=f"Rolling {config.ROLLING_ATTRITION_MONTHS}-Month Attrition (%)",
+                   line=dict(color=config.COLORS['secondary'])),
+        secondary_y=True
+    )
+    fig.update_yaxes(title_text="Headcount", secondary_y=False)
+    fig.update_yaxes(title_text="Attrition Rate (%)", secondary_y=True)
+    fig.update_layout(height=400, legend=dict(orientation='h', y=-0.2))
+    return fig
+
+def survival_figure(curves):
+    fig = px.line(
+        curves,
+        x='tenure_years',
+        y='survival',
+        color='department',
+        line_shape='hv',
+        labels={'tenure_years': 'Tenure (Years)', 'survival': 'Retention Probability', 'department': 'Department'}
+    )
+    fig.update_layout(height=400)
+    return fig
+
+def render_trace_panel(trace):
+    with st.sidebar.expander("Timing Panel", expanded=True):
+        st.caption(f"Traced render time: {trace.total_seconds() * 1000:.1f} ms")
+        stages = pd.DataFrame(trace.stages)
+        if not stages.empty:
+            stages['stage'] = [
+                '· ' * depth + stage for depth, stage in zip(stages['depth'], stages['stage'])
+            ]
+            stages['ms'] = (stages.pop('seconds') * 1000).round(2)
+            st.dataframe(stages.drop(columns='depth'), use_container_width=True, hide_index=True)
+        if st.button("Save Trace File"):
+            st.success(f"Trace written to {trace.dump()}")
+
 def main():
     st.title(config.DASHBOARD_TITLE)
     st.markdown(f"### {config.DASHBOARD_SUBTITLE}")
     
+    show_timings = st.sidebar.checkbox("Show timing panel", value=config.TRACE_ENABLED)
+    if show_timings:
+        start_trace('dashboard')
+    
     try:
-        processor, df = load_data()
-        
-        stats = processor.get_basic_stats()
-        dept_attrition = processor.get_department_attrition()
-        gender_attrition = processor.get_gender_attrition()
-        tech_attrition = processor.get_technical_attrition()
-        salary_stats, salary_by_attrition = processor.get_salary_analysis()
+        with trace_stage('app.load_data'):
+            processor, _ = load_data()
+            processor.refresh()
+            df = processor.df
         
         st.sidebar.header("Filters")
         departments = st.sidebar.multiselect(
@@ -54,12 +210,21 @@ def main():
             value=(int(df['age'].min()), int(df['age'].max()))
         )
         
-        filtered_df = df[
-            (df['department'].isin(departments)) &
-            (df['gender'].isin(genders)) &
-            (df['age'] >= age_range[0]) &
-            (df['age'] <= age_range[1])
-        ]
+        filters = {
+            'department': departments,
+            'gender': genders,
+            'age': age_range
+        }
+        result = processor.query(filters)
+        
+        if result.stats['total_employees'] == 0:
+            st.warning("No employees match the selected filters.")
+            st.stop()
+        
+        stats = result.stats
+        dept_attrition = result.department_attrition
+        gender_attrition = result.gender_attrition
+        tech_attrition = result.technical_attrition
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -79,107 +244,107 @@ def main():
         
         col1, col2 = st.columns(2)
         
-        with col1:
+        with col1, trace_stage('app.figure.department'):
             st.subheader("Attrition Rate by Department")
-            fig_dept = px.bar(
-                dept_attrition.reset_index(),
-                x='attrition_rate',
-                y='department',
-                orientation='h',
-                labels={'attrition_rate': 'Attrition Rate (%)', 'department': 'Department'},
-                color='attrition_rate',
-                color_continuous_scale='Reds'
-            )
-            fig_dept.update_layout(height=400, showlegend=False)
+            fig_dept = shared_figure_cache.get_or_build('app.department', department_figure, dept_attrition)
             st.plotly_chart(fig_dept, use_container_width=True)
         
-        with col2:
+        with col2, trace_stage('app.figure.gender'):
             st.subheader("Gender Attrition Comparison")
-            fig_gender = px.bar(
-                gender_attrition.reset_index(),
-                x='gender',
-                y='attrition_rate',
-                labels={'attrition_rate': 'Attrition Rate (%)', 'gender': 'Gender'},
-                color='gender',
-                color_discrete_map={'Male': '#66b3ff', 'Female': '#ff9999'}
-            )
-            fig_gender.update_layout(height=400, showlegend=False)
+            fig_gender = shared_figure_cache.get_or_build('app.gender', gender_figure, gender_attrition)
             st.plotly_chart(fig_gender, use_container_width=True)
         
         col1, col2 = st.columns(2)
         
-        with col1:
+        with col1, trace_stage('app.figure.technical'):
             st.subheader("Technical Background Attrition")
-            fig_tech = px.bar(
-                tech_attrition.reset_index(),
-                x='technical_background',
-                y='attrition_rate',
-                labels={'attrition_rate': 'Attrition Rate (%)', 'technical_background': 'Technical Background'},
-                color='technical_background',
-                color_discrete_map={'Yes': '#66b3ff', 'No': '#ff9999'}
-            )
-            fig_tech.update_layout(height=400, showlegend=False)
+            fig_tech = shared_figure_cache.get_or_build('app.technical', technical_figure, tech_attrition)
             st.plotly_chart(fig_tech, use_container_width=True)
         
-        with col2:
+        with col2, trace_stage('app.figure.salary'):
             st.subheader("Salary Distribution")
-            fig_salary = px.histogram(
-                filtered_df,
-                x='salary',
-                nbins=20,
-                labels={'salary': 'Salary ($)', 'count': 'Number of Employees'},
-                color_discrete_sequence=[config.COLORS['success']]
-            )
-            fig_salary.add_vline(
-                x=stats['average_salary'],
-                line_dash="dash",
-                line_color="red",
-                annotation_text=f"Mean: ${stats['average_salary']:,.0f}"
+            salary_counts, salary_edges = processor.get_histogram('salary', filters=filters)
+            fig_salary = shared_figure_cache.get_or_build(
+                'app.salary', histogram_figure, salary_counts, salary_edges,
+                'Salary ($)', config.COLORS['success'], mean=stats['average_salary']
             )
-            fig_salary.update_layout(height=400, showlegend=False)
             st.plotly_chart(fig_salary, use_container_width=True)
         
         st.markdown("---")
         
         col1, col2 = st.columns(2)
         
-        with col1:
+        with col1, trace_stage('app.figure.age'):
             st.subheader("Age Distribution")
-            fig_age = px.histogram(
-                filtered_df,
-                x='age',
-                nbins=15,
-                labels={'age': 'Age', 'count': 'Number of Employees'},
-                color_discrete_sequence=[config.COLORS['warning']]
+            age_counts, age_edges = processor.get_histogram('age', filters=filters)
+            fig_age = shared_figure_cache.get_or_build(
+                'app.age', histogram_figure, age_counts, age_edges, 'Age', config.COLORS['warning']
             )
-            fig_age.update_layout(height=400, showlegend=False)
             st.plotly_chart(fig_age, use_container_width=True)
         
-        with col2:
+        with col2, trace_stage('app.figure.performance'):
             if 'performance_rating' in df.columns:
                 st.subheader("Performance Rating Distribution")
-                perf_dist = filtered_df['performance_rating'].value_counts().sort_index()
-                fig_perf = px.bar(
-                    x=perf_dist.index,
-                    y=perf_dist.values,
-                    labels={'x': 'Performance Rating', 'y': 'Number of Employees'},
-                    color_discrete_sequence=[config.COLORS['info']]
-                )
-                fig_perf.update_layout(height=400, showlegend=False)
+                perf_dist = result.performance_analysis['total_employees']
+                fig_perf = shared_figure_cache.get_or_build('app.performance', performance_figure, perf_dist)
                 st.plotly_chart(fig_perf, use_container_width=True)
         
         st.markdown("---")
         
+        if 'hire_date' in df.columns and 'attrition_date' in df.columns:
+            col1, col2 = st.columns(2)
+            
+            with col1, trace_stage('app.figure.trend'):
+                st.subheader("Headcount & Attrition Trend")
+                trend = processor.get_attrition_timeseries(departments)
+                fig_trend = shared_figure_cache.get_or_build('app.trend', trend_figure, trend)
+                st.plotly_chart(fig_trend, use_container_width=True)
+            
+            with col2, trace_stage('app.figure.survival'):
+                st.subheader("Tenure Survival by Department")
+                curves = processor.get_tenure_survival(departments)
+                fig_survival = shared_figure_cache.get_or_build('app.survival', survival_figure, curves)
+                st.plotly_chart(fig_survival, use_container_width=True)
+            
+            st.caption("Trends and survival curves follow the department filter only.")
+            
+            st.markdown("---")
+        
         st.subheader("Detailed Analysis Table")
-        display_cols = ['employee_id', 'department', 'gender', 'age', 'salary', 
-                       'attrition', 'technical_background']
-        if 'performance_rating' in df.columns:
-            display_cols.append('performance_rating')
-        
-        st.dataframe(
-            filtered_df[display_cols],
-            use_container_width=True,
-            height=300
+        display_cols = [col for col in config.TABLE_COLUMNS if col in df.columns]
+        
+        col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+        with col1:
+            search = st.text_input("Search", placeholder="Department, gender, employee ID...")
+        with col2:
+            sort_by = st.selectbox("Sort by", options=display_cols)
+        with col3:
+            sort_order = st.selectbox("Order", options=["Ascending", "Descending"])
+        
+        _, total_rows = processor.get_page(
+            filters, page_size=0, sort_by=sort_by,
+            ascending=sort_order == "Ascending", search=search
+        )
+        page_count = max(1, -(-total_rows // config.TABLE_PAGE_SIZE))
+        with col4:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1)
+        
+        with trace_stage('app.detail_table', rows=config.TABLE_PAGE_SIZE):
+            page_df, total_rows = processor.get_page(
+                filters, page=page - 1, sort_by=sort_by,
+                ascending=sort_order == "Ascending", search=search
+            )
+            st.dataframe(
+                page_df,
+                use_container_width=True,
+                height=300,
+                hide_index=True
+            )
+        
+        first_row = (page - 1) * config.TABLE_PAGE_SIZE + 1 if total_rows else 0
+        st.caption(
+            f"Showing {first_row:,}-{first_row + len(page_df) - 1 if total_rows else 0:,} "
+            f"of {total_rows:,} employees"
         )
         
         st.markdown("---")
@@ -197,43 +362,126 @@ def main():
         - Lowest Attrition: {dept_attrition.index[-1]} ({dept_attrition.iloc[-1]['attrition_rate']:.1f}%)
         
         **Gender Analysis:**
-        - Female Attrition: {gender_attrition.loc['Female', 'attrition_rate']:.1f}%
-        - Male Attrition: {gender_attrition.loc['Male', 'attrition_rate']:.1f}%
+        - Female Attrition: {format_rate(gender_attrition, 'Female')}
+        - Male Attrition: {format_rate(gender_attrition, 'Male')}
         
         **Technical Background:**
-        - Technical Employees Attrition: {tech_attrition.loc['Yes', 'attrition_rate']:.1f}%
-        - Non-Technical Employees Attrition: {tech_attrition.loc['No', 'attrition_rate']:.1f}%
+        - Technical Employees Attrition: {format_rate(tech_attrition, 'Yes')}
+        - Non-Technical Employees Attrition: {format_rate(tech_attrition, 'No')}
         """
         st.markdown(insights)
         
         st.markdown("---")
         
+        with trace_stage('app.salary_bands'):
+            st.subheader("Salary Bands")
+            salary_index = processor.get_salary_index()
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                edges_text = st.text_input(
+                    "Band edges ($)", value=" ".join(f"{edge:g}" for edge in config.SALARY_BAND_EDGES)
+                )
+                edges = parse_band_edges(edges_text)
+                if edges is None:
+                    st.warning("Band edges must be numbers separated by spaces or commas.")
+                else:
+                    labels = config.SALARY_BAND_LABELS if edges == config.SALARY_BAND_EDGES else None
+                    bands = processor.get_salary_bands(edges, labels)
+                    fig_bands = shared_figure_cache.get_or_build('app.salary_bands', salary_band_figure, bands)
+                    st.plotly_chart(fig_bands, use_container_width=True)
+                    st.dataframe(bands, use_container_width=True)
+            
+            with col2:
+                low_salary, high_salary = salary_index.quantile([0.0, 1.0])
+                salary_range = st.slider(
+                    "Salary range ($)", min_value=int(low_salary), max_value=int(high_salary) + 1,
+                    value=(int(low_salary), int(high_salary) + 1), step=1000
+                )
+                range_stats = processor.get_salary_range_attrition(*salary_range)
+                col_a, col_b = st.columns(2)
+                col_a.metric("Employees in Range", f"{range_stats['total_employees']:,}")
+                col_b.metric(
+                    "Attrition in Range",
+                    f"{range_stats['attrition_rate']:.1f}%" if range_stats['total_employees'] else "n/a"
+                )
+                
+                percentiles = processor.get_salary_quantiles([0.1, 0.25, 0.5, 0.75, 0.9])
+                st.markdown("**Salary Percentiles:**")
+                for label, value in zip(["P10", "P25", "Median", "P75", "P90"], percentiles):
+                    st.markdown(f"- {label}: ${value:,.0f}")
+            
+            st.caption("Salary bands cover the whole workforce; each band includes its lower edge.")
+        
+        st.markdown("---")
+        
+        with trace_stage('app.segments'):
+            st.subheader("Highest-Attrition Segments")
+            col1, col2 = st.columns(2)
+            with col1:
+                min_support = st.number_input(
+                    "Minimum employees per segment", min_value=1, value=config.CROSSTAB_MIN_SUPPORT
+                )
+            with col2:
+                segment_orders = st.multiselect(
+                    "Dimensions per segment", options=[2, 3], default=[2, 3]
+                )
+            if segment_orders:
+                segments = processor.get_attrition_segments(
+                    orders=tuple(sorted(segment_orders)), min_support=min_support,
+                    top=config.CROSSTAB_TOP_SEGMENTS
+                )
+                st.dataframe(segments, use_container_width=True, hide_index=True)
+                st.caption("Segments across the whole workforce; p-values from a chi-square test "
+                           "of segment membership against attrition.")
+        
+        st.markdown("---")
+        
         st.subheader("Predictive Analytics - Attrition Risk Prediction")
         
+        predictor = load_predictor(processor.data_version)
+        if predictor.model is None:
+            predictor.load()
+        
         with st.expander("Train & View Model Performance"):
             if st.button("Train Attrition Prediction Model"):
                 with st.spinner("Training model..."):
-                    predictor = AttritionPredictor(df)
-                    accuracy, report = predictor.train_model()
-                    st.session_state['predictor'] = predictor
-                    st.success(f"Model trained successfully! Accuracy: {accuracy:.2%}")
-                    st.text(report)
-                    
-                    if predictor.feature_importance is not None:
-                        st.subheader("Feature Importance")
-                        fig_importance = px.bar(
-                            predictor.feature_importance,
-                            x='importance',
-                            y='feature',
-                            orientation='h',
-                            labels={'importance': 'Importance Score', 'feature': 'Feature'},
-                            color='importance',
-                            color_continuous_scale='Blues'
-                        )
-                        fig_importance.update_layout(height=300, showlegend=False)
-                        st.plotly_chart(fig_importance, use_container_width=True)
-        
-        if 'predictor' in st.session_state:
+                    predictor.train_model()
+                    predictor.save()
+            
+            tuning_job = st.session_state.get('tuning_job')
+            tuning_running = tuning_job is not None and not tuning_job.done()
+            if st.button("Tune Model in Background", disabled=tuning_running):
+                st.session_state['tuning_job'] = start_tuning_job(df)
+                tuning_running = True
+            
+            if tuning_running:
+                st.info("Hyperparameter tuning is running in the background.")
+            elif tuning_job is not None:
+                try:
+                    tuning_results, best_params, _ = tuning_job.result()
+                    predictor.load()
+                    st.caption(f"Best cross-validated parameters: {best_params}")
+                    st.dataframe(tuning_results, use_container_width=True)
+                except Exception as e:
+                    st.error(f"Tuning error: {str(e)}")
+            
+            if predictor.model is not None:
+                st.success(f"Model ready! Accuracy: {predictor.accuracy:.2%}")
+                st.text(predictor.report)
+                if predictor.training_timings:
+                    st.caption("Training time: " + ", ".join(
+                        f"{phase} {seconds:.2f}s" for phase, seconds in predictor.training_timings.items()
+                    ))
+                
+                if predictor.feature_importance is not None:
+                    st.subheader("Feature Importance")
+                    fig_importance = shared_figure_cache.get_or_build(
+                        'app.feature_importance', importance_figure, predictor.feature_importance
+                    )
+                    st.plotly_chart(fig_importance, use_container_width=True)
+        
+        if predictor.model is not None:
             st.subheader("Predict Attrition for New Employee")
             col1, col2, col3 = st.columns(3)
             
@@ -274,21 +522,26 @@ def main():
                     employee_data['work_life_balance'] = pred_wlb
                 
                 try:
-                    result = st.session_state['predictor'].predict_attrition(employee_data)
+                    result = predictor.predict_attrition(employee_data)
                     
                     col1, col2 = st.columns(2)
                     with col1:
                         st.metric("Predicted Attrition", result['prediction'])
                     with col2:
-                        risk_color = "🔴" if result['probability'] > 50 else "🟡" if result['probability'] > 25 else "🟢"
+                        risk_color = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}[result['risk_band']]
                         st.metric("Risk Probability", f"{result['probability']:.1f}%", delta=None)
-                        st.markdown(f"**Risk Level:** {risk_color}")
+                        st.markdown(f"**Risk Level:** {risk_color} {result['risk_band']}")
                 except Exception as e:
                     st.error(f"Prediction error: {str(e)}")
         
     except Exception as e:
         st.error(f"Error loading dashboard: {str(e)}")
         st.exception(e)
+    finally:
+        trace = stop_trace() if show_timings else None
+    
+    if trace is not None:
+        render_trace_panel(trace)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,183 @@
+import pandas as pd
+import numpy as np
+import itertools
+import math
+import logging
+import config
+from data_processor import attrition_flag, build_attrition_table
+from tracing import traced
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CROSSTAB_DIMENSIONS = [
+    'department',
+    'gender',
+    'education',
+    'overtime',
+    'travel_frequently',
+    'technical_background',
+    'performance_rating',
+    'work_life_balance'
+]
+
+_erfc = np.vectorize(math.erfc, otypes=[np.float64])
+
+
+def chi_square_2x2(totals, leavers, population, population_leavers):
+    totals = np.asarray(totals, dtype=np.float64)
+    leavers = np.asarray(leavers, dtype=np.float64)
+    stayers = totals - leavers
+    other_leavers = population_leavers - leavers
+    other_stayers = (population - totals) - other_leavers
+
+    numerator = population * (leavers * other_stayers - stayers * other_leavers) ** 2
+    denominator = totals * (population - totals) * population_leavers * (population - population_leavers)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        statistic = np.where(denominator > 0, numerator / denominator, 0.0)
+    return statistic, _erfc(np.sqrt(statistic / 2))
+
+
+def _labels(level):
+    if pd.api.types.is_bool_dtype(level):
+        return pd.Index(np.where(level, 'Yes', 'No'), name=level.name)
+    return level
+
+
+class CrossTabEngine:
+    def __init__(self, dimensions, levels, cells):
+        self.dimensions = dimensions
+        self.levels = levels
+        self.cells = cells
+        self.population = int(cells['count'].sum())
+        self.population_leavers = int(cells['leavers'].sum())
+
+    @classmethod
+    @traced('CrossTabEngine.from_processor')
+    def from_processor(cls, processor, dimensions=None):
+        df = processor.df
+        dimensions = [dim for dim in (dimensions or CROSSTAB_DIMENSIONS) if dim in df.columns]
+
+        combined = np.zeros(len(df), dtype=np.int64)
+        levels = {}
+        codes = {}
+        for dim in dimensions:
+            dim_codes, level = processor._column_codes(dim)
+            codes[dim] = np.where(dim_codes < 0, len(level), dim_codes)
+            levels[dim] = _labels(level.rename(dim))
+            combined = combined * (len(level) + 1) + codes[dim]
+
+        cell_ids, first_row, inverse = np.unique(combined, return_index=True, return_inverse=True)
+        cells = pd.DataFrame({dim: codes[dim][first_row].astype(np.int32) for dim in dimensions})
+        cells['count'] = np.bincount(inverse, minlength=len(cell_ids))
+        cells['leavers'] = np.bincount(
+            inverse, weights=processor._attrition_flag(), minlength=len(cell_ids)
+        ).astype(np.int64)
+
+        logger.info(f"Cross-tab cells built: {len(cells)} cells over {len(dimensions)} dimensions")
+        return cls(dimensions, levels, cells)
+
+    def _frame_codes(self, frame):
+        codes = {}
+        for dim in self.dimensions:
+            values = _labels(pd.Index(frame[dim].to_numpy()))
+            level = self.levels[dim]
+            dim_codes = level.get_indexer(values)
+            missing = np.asarray(values.isna())
+            if ((dim_codes < 0) & ~missing).any():
+                return None
+            codes[dim] = np.where(missing, len(level), dim_codes).astype(np.int32)
+        return codes
+
+    def apply_delta(self, removed, added):
+        parts = [self.cells]
+        for frame, sign in ((removed, -1), (added, 1)):
+            if len(frame) == 0:
+                continue
+            codes = self._frame_codes(frame)
+            if codes is None:
+                return None
+            part = pd.DataFrame(codes)
+            part['count'] = sign
+            part['leavers'] = sign * attrition_flag(frame).astype(np.int64)
+            parts.append(part)
+
+        cells = pd.concat(parts, ignore_index=True).groupby(self.dimensions, sort=True).sum().reset_index()
+        cells = cells[cells['count'] > 0].reset_index(drop=True)
+        return CrossTabEngine(self.dimensions, self.levels, cells)
+
+    def _marginal(self, dimensions, min_support):
+        missing = [dim for dim in dimensions if dim not in self.levels]
+        if missing:
+            raise ValueError(f"Unknown cross-tab dimensions: {missing}")
+
+        valid = np.ones(len(self.cells), dtype=bool)
+        combined = np.zeros(len(self.cells), dtype=np.int64)
+        shape = tuple(len(self.levels[dim]) for dim in dimensions)
+        for dim, size in zip(dimensions, shape):
+            dim_codes = self.cells[dim].to_numpy()
+            valid &= dim_codes < size
+            combined = combined * size + np.minimum(dim_codes, size - 1)
+
+        size = int(np.prod(shape))
+        totals = np.bincount(combined[valid], weights=self.cells['count'].to_numpy()[valid], minlength=size)
+        leavers = np.bincount(combined[valid], weights=self.cells['leavers'].to_numpy()[valid], minlength=size)
+        present = np.flatnonzero(totals >= max(min_support, 1))
+
+        values = [
+            self.levels[dim][pos]
+            for dim, pos in zip(dimensions, np.unravel_index(present, shape))
+        ]
+        return values, totals[present].astype(np.int64), leavers[present].astype(np.int64)
+
+    def crosstab(self, dimensions, min_support=config.CROSSTAB_MIN_SUPPORT):
+        dimensions = list(dimensions)
+        values, totals, leavers = self._marginal(dimensions, min_support)
+        table = build_attrition_table(pd.MultiIndex.from_arrays(values, names=dimensions), totals, leavers)
+        table['chi_square'], table['p_value'] = chi_square_2x2(
+            totals, leavers, self.population, self.population_leavers
+        )
+        return table
+
+    def segments(self, orders=(2, 3), min_support=config.CROSSTAB_MIN_SUPPORT, dimensions=None):
+        dimensions = [dim for dim in (dimensions or self.dimensions) if dim in self.levels]
+        labels, names, order_ids, totals, leavers = [], [], [], [], []
+        for order in orders:
+            for combo in itertools.combinations(dimensions, order):
+                values, combo_totals, combo_leavers = self._marginal(combo, min_support)
+                if len(combo_totals) == 0:
+                    continue
+                labels.extend(
+                    ', '.join(f"{dim}={value}" for dim, value in zip(combo, key))
+                    for key in zip(*values)
+                )
+                names.extend([' × '.join(combo)] * len(combo_totals))
+                order_ids.extend([order] * len(combo_totals))
+                totals.append(combo_totals)
+                leavers.append(combo_leavers)
+
+        columns = ['segment', 'dimensions', 'order', 'total_employees', 'employees_left',
+                   'attrition_rate', 'lift', 'chi_square', 'p_value']
+        if not totals:
+            return pd.DataFrame(columns=columns)
+
+        totals = np.concatenate(totals)
+        leavers = np.concatenate(leavers)
+        rates = np.round(leavers / totals * 100, 2)
+        statistic, p_value = chi_square_2x2(totals, leavers, self.population, self.population_leavers)
+        overall_rate = self.population_leavers / self.population * 100
+
+        segments = pd.DataFrame({
+            'segment': labels,
+            'dimensions': names,
+            'order': order_ids,
+            'total_employees': totals,
+            'employees_left': leavers,
+            'attrition_rate': rates,
+            'lift': np.round(rates / overall_rate, 3),
+            'chi_square': statistic,
+            'p_value': p_value
+        })
+        return segments.sort_values(
+            ['attrition_rate', 'p_value'], ascending=[False, True], kind='stable'
+        ).reset_index(drop=True)
@@ -0,0 +1,217 @@
+import pandas as pd
+import numpy as np
+import logging
+import config
+from data_processor import attrition_flag, build_attrition_table
+from tracing import traced
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CUBE_DIMENSIONS = [
+    'department',
+    'gender',
+    'age',
+    'technical_background',
+    'performance_rating',
+    'work_life_balance',
+    'salary_bin'
+]
+
+
+class AttritionCube:
+    def __init__(self, cells, levels, salary_edges):
+        self.cells = cells
+        self.levels = levels
+        self.salary_edges = salary_edges
+
+    @classmethod
+    @traced('AttritionCube.from_processor')
+    def from_processor(cls, processor, salary_bins=config.CUBE_SALARY_BINS):
+        df = processor.df
+        salary = df['salary'].to_numpy(dtype=np.float64)
+        salary_edges = processor.histogram_edges('salary', salary_bins)
+
+        dimensions = [dim for dim in CUBE_DIMENSIONS if dim == 'salary_bin' or dim in df.columns]
+        codes = {}
+        levels = {}
+        for dim in dimensions:
+            if dim == 'salary_bin':
+                dim_codes = np.searchsorted(salary_edges, salary, side='right') - 1
+                dim_codes = np.clip(dim_codes, 0, salary_bins - 1)
+                level = pd.RangeIndex(salary_bins, name=dim)
+            else:
+                dim_codes, level = processor._column_codes(dim)
+                level = level.rename(dim)
+            if (dim_codes < 0).any():
+                dim_codes = np.where(dim_codes < 0, len(level), dim_codes)
+                level = level.append(pd.Index([np.nan], name=dim))
+            codes[dim] = dim_codes
+            levels[dim] = level
+
+        combined = np.zeros(len(df), dtype=np.int64)
+        for dim in dimensions:
+            combined = combined * len(levels[dim]) + codes[dim]
+
+        cell_ids, first_row, inverse = np.unique(combined, return_index=True, return_inverse=True)
+        flag = processor._attrition_flag()
+        cells = pd.DataFrame({
+            dim: codes[dim][first_row].astype(np.int32) for dim in dimensions
+        })
+        cells['count'] = np.bincount(inverse, minlength=len(cell_ids))
+        cells['leavers'] = np.bincount(inverse, weights=flag, minlength=len(cell_ids)).astype(np.int64)
+        cells['salary_sum'] = np.bincount(inverse, weights=np.nan_to_num(salary), minlength=len(cell_ids))
+
+        logger.info(f"Attrition cube built: {len(cells)} cells from {len(df)} records")
+        return cls(cells, levels, salary_edges)
+
+    @property
+    def dimensions(self):
+        return [dim for dim in self.cells.columns if dim not in ('count', 'leavers', 'salary_sum')]
+    
+    def _frame_codes(self, frame):
+        codes = {}
+        for dim in self.dimensions:
+            if dim == 'salary_bin':
+                salary = frame['salary'].to_numpy(dtype=np.float64)
+                if (salary < self.salary_edges[0]).any() or (salary > self.salary_edges[-1]).any():
+                    return None
+                dim_codes = np.searchsorted(self.salary_edges, salary, side='right') - 1
+                dim_codes = np.clip(dim_codes, 0, len(self.salary_edges) - 2)
+            else:
+                dim_codes = self.levels[dim].get_indexer(pd.Index(frame[dim].to_numpy()))
+                if (dim_codes < 0).any():
+                    return None
+            codes[dim] = dim_codes.astype(np.int32)
+        return codes
+    
+    def apply_delta(self, removed, added):
+        dimensions = self.dimensions
+        parts = [self.cells]
+        for frame, sign in ((removed, -1), (added, 1)):
+            if len(frame) == 0:
+                continue
+            codes = self._frame_codes(frame)
+            if codes is None:
+                return None
+            part = pd.DataFrame(codes)
+            part['count'] = sign
+            part['leavers'] = sign * attrition_flag(frame).astype(np.int64)
+            part['salary_sum'] = sign * np.nan_to_num(frame['salary'].to_numpy(dtype=np.float64))
+            parts.append(part)
+        
+        cells = pd.concat(parts, ignore_index=True).groupby(dimensions, sort=True).sum().reset_index()
+        cells = cells[cells['count'] > 0].reset_index(drop=True)
+        return AttritionCube(cells, self.levels, self.salary_edges)
+    
+    def _level_mask(self, dim, selection):
+        level = self.levels[dim]
+        if isinstance(selection, tuple) and len(selection) == 2:
+            low, high = selection
+            return np.asarray((level >= low) & (level <= high))
+        return np.asarray(level.isin(list(selection)))
+
+    def select(self, filters):
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, selection in filters.items():
+            if selection is None or dim not in self.levels:
+                continue
+            allowed = self._level_mask(dim, selection)
+            mask &= allowed[self.cells[dim].to_numpy()]
+        return AttritionCube(self.cells[mask], self.levels, self.salary_edges)
+
+    def _weighted_counts(self, dim):
+        codes = self.cells[dim].to_numpy()
+        size = len(self.levels[dim])
+        counts = np.bincount(codes, weights=self.cells['count'], minlength=size).astype(np.int64)
+        leavers = np.bincount(codes, weights=self.cells['leavers'], minlength=size).astype(np.int64)
+        return counts, leavers
+
+    def get_basic_stats(self):
+        total = int(self.cells['count'].sum())
+        if total == 0:
+            return {
+                'total_employees': 0,
+                'attrition_rate': np.nan,
+                'average_age': np.nan,
+                'average_salary': np.nan
+            }
+
+        ages = self.levels['age'].to_numpy(dtype=np.float64)[self.cells['age'].to_numpy()]
+        return {
+            'total_employees': total,
+            'attrition_rate': self.cells['leavers'].sum() / total * 100,
+            'average_age': np.nansum(ages * self.cells['count']) / total,
+            'average_salary': self.cells['salary_sum'].sum() / total
+        }
+
+    def breakdown(self, dim):
+        if dim not in self.levels:
+            return None
+
+        counts, leavers = self._weighted_counts(dim)
+        present = np.flatnonzero(counts)
+        return build_attrition_table(self.levels[dim][present], counts[present], leavers[present])
+
+    def histogram(self, dim, edges):
+        if dim == 'salary' and np.array_equal(edges, self.salary_edges):
+            counts, _ = self._weighted_counts('salary_bin')
+            return counts
+        if dim not in self.levels:
+            return None
+        
+        counts, _ = self._weighted_counts(dim)
+        values = self.levels[dim].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        binned, _ = np.histogram(values[valid], bins=edges, weights=counts[valid])
+        return binned.astype(np.int64)
+
+
+class QueryResult:
+    def __init__(self, filters, cube):
+        self.filters = filters
+        self.cube = cube
+        self.stats = cube.get_basic_stats()
+
+        dept_attrition = cube.breakdown('department')
+        self.department_attrition = dept_attrition.sort_values('attrition_rate', ascending=False)
+        self.gender_attrition = cube.breakdown('gender')
+        self.technical_attrition = cube.breakdown('technical_background')
+        self.performance_analysis = cube.breakdown('performance_rating')
+        self.worklife_balance_analysis = cube.breakdown('work_life_balance')
+
+
+def normalize_filters(filters, levels):
+    normalized = {}
+    for dim, selection in filters.items():
+        if selection is None or dim not in levels:
+            continue
+
+        level = levels[dim]
+        if isinstance(selection, tuple) and len(selection) == 2:
+            low, high = (value.item() if hasattr(value, 'item') else value for value in selection)
+            if low <= level.min() and high >= level.max():
+                continue
+            normalized[dim] = (low, high)
+        else:
+            values = frozenset(value.item() if hasattr(value, 'item') else value for value in selection)
+            if level.isin(list(values)).all():
+                continue
+            normalized[dim] = values
+
+    return tuple(sorted(normalized.items()))
+
+
+def filter_covers(broad_key, narrow_key):
+    narrow = dict(narrow_key)
+    for dim, selection in broad_key:
+        if dim not in narrow:
+            return False
+        if isinstance(selection, tuple):
+            if not isinstance(narrow[dim], tuple):
+                return False
+            if narrow[dim][0] < selection[0] or narrow[dim][1] > selection[1]:
+                return False
+        elif not narrow[dim] <= selection:
+            return False
+    return True
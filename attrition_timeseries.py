@@ -0,0 +1,226 @@
+import pandas as pd
+import numpy as np
+import logging
+import config
+from data_processor import attrition_flag, update_sorted
+from tracing import traced
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DAYS_PER_YEAR = 365.25
+_KEY_SHIFT = 34
+_DAY_OFFSET = 1 << 33
+
+
+def _days(series):
+    values = series.to_numpy(dtype='datetime64[D]')
+    return values.astype(np.int64), np.isnat(values)
+
+
+def _month(value):
+    return np.datetime64(pd.Timestamp(value), 'M')
+
+
+def _today():
+    return int(np.datetime64(pd.Timestamp.today(), 'D').astype(np.int64))
+
+
+def _events(frame, codes):
+    hire, hire_missing = _days(frame['hire_date'])
+    leave, leave_missing = _days(frame['attrition_date'])
+    hired = ~hire_missing & (codes >= 0)
+    left = (attrition_flag(frame) == 1) & ~leave_missing & hired
+    return codes, hire, leave, hired, left
+
+
+def _latest(codes, hire, leave, hired, left):
+    return int(max(hire[hired].max(initial=0), leave[left].max(initial=0)))
+
+
+def _keyed(codes, hire, leave, hired, left, as_of):
+    hired = hired & (hire <= as_of)
+    left = left & hired & (leave <= as_of)
+    observed = left[hired]
+    tenure = np.maximum(np.where(observed, leave[hired], as_of) - hire[hired], 0)
+    return {
+        'hire': (_keys(codes[hired], hire[hired]), None),
+        'leave': (_keys(codes[left], leave[left]), None),
+        'tenure': (_keys(codes[hired], tenure), observed)
+    }
+
+
+def _keys(codes, days):
+    return (codes.astype(np.int64) << _KEY_SHIFT) + days + _DAY_OFFSET
+
+
+def _grouped(keys, n_groups):
+    codes = keys >> _KEY_SHIFT
+    return keys - (codes << _KEY_SHIFT) - _DAY_OFFSET, np.searchsorted(codes, np.arange(n_groups + 1))
+
+
+def _ungrouped(days, offsets):
+    return _keys(np.repeat(np.arange(len(offsets) - 1), np.diff(offsets)), days)
+
+
+class EventIndex:
+    def __init__(self, hire_days, hire_offsets, leave_days, leave_offsets, tenure_days, observed,
+                 tenure_offsets, groups, as_of, latest_event=None, fixed_as_of=True):
+        self.hire_days = hire_days
+        self.hire_offsets = hire_offsets
+        self.leave_days = leave_days
+        self.leave_offsets = leave_offsets
+        self.tenure_days = tenure_days
+        self.observed = observed
+        self.tenure_offsets = tenure_offsets
+        self.groups = groups
+        self.as_of = as_of
+        self.latest_event = latest_event
+        self.fixed_as_of = fixed_as_of
+
+    @classmethod
+    def _from_keyed(cls, keyed, groups, as_of, latest_event, fixed_as_of):
+        hire_days, hire_offsets = _grouped(keyed['hire'][0], len(groups))
+        leave_days, leave_offsets = _grouped(keyed['leave'][0], len(groups))
+        tenure_days, tenure_offsets = _grouped(keyed['tenure'][0], len(groups))
+        return cls(hire_days, hire_offsets, leave_days, leave_offsets, tenure_days, keyed['tenure'][1],
+                   tenure_offsets, groups, as_of, latest_event, fixed_as_of)
+
+    @classmethod
+    @traced('EventIndex.from_processor')
+    def from_processor(cls, processor, group_by='department', as_of=None):
+        codes, groups = processor._column_codes(group_by)
+        events = _events(processor.df, codes)
+        latest = _latest(*events)
+
+        fixed_as_of = as_of is not None
+        if fixed_as_of:
+            as_of = int(np.datetime64(pd.Timestamp(as_of), 'D').astype(np.int64))
+        else:
+            as_of = min(_today(), latest)
+
+        keyed = {}
+        for name, (keys, values) in _keyed(*events, as_of).items():
+            order = np.argsort(keys, kind='stable')
+            keyed[name] = (keys[order], None if values is None else values[order])
+
+        future = int(events[4].sum()) - len(keyed['leave'][0])
+        if future:
+            logger.info(f"Ignoring {future} attrition events after {np.datetime64(as_of, 'D')}")
+        logger.info(
+            f"Event index built: {len(keyed['hire'][0])} hires, {len(keyed['leave'][0])} leavers "
+            f"across {len(groups)} {group_by} groups"
+        )
+        return cls._from_keyed(keyed, groups.rename(group_by), as_of, latest, fixed_as_of)
+
+    def apply_delta(self, removed, added):
+        events = []
+        for frame in (removed, added):
+            values = pd.Index(frame[self.groups.name].to_numpy())
+            codes = self.groups.get_indexer(values)
+            if ((codes < 0) & ~np.asarray(values.isna())).any():
+                return None
+            events.append(_events(frame, codes))
+
+        if self.latest_event is None or _latest(*events[0]) >= self.latest_event:
+            return None
+        latest = max(self.latest_event, _latest(*events[1]))
+        if not self.fixed_as_of and min(_today(), latest) != self.as_of:
+            return None
+
+        current = {
+            'hire': (_ungrouped(self.hire_days, self.hire_offsets), None),
+            'leave': (_ungrouped(self.leave_days, self.leave_offsets), None),
+            'tenure': (_ungrouped(self.tenure_days, self.tenure_offsets), self.observed)
+        }
+        old, new = (_keyed(*frame_events, self.as_of) for frame_events in events)
+        keyed = {}
+        for name, (keys, values) in current.items():
+            keyed[name] = update_sorted(keys, values, *old[name], *new[name])
+            if keyed[name] is None:
+                return None
+        return EventIndex._from_keyed(keyed, self.groups, self.as_of, latest, self.fixed_as_of)
+
+    def _group_codes(self, groups):
+        if groups is None:
+            return np.arange(len(self.groups))
+        return self.groups.get_indexer(pd.Index(list(groups)))
+
+    def _counts_before(self, days, offsets, codes, boundaries):
+        counts = np.zeros(len(boundaries), dtype=np.int64)
+        for code in codes[codes >= 0]:
+            segment = days[offsets[code]:offsets[code + 1]]
+            counts += np.searchsorted(segment, boundaries, side='left')
+        return counts
+
+    def monthly_series(self, groups=None, start=None, end=None, window=config.ROLLING_ATTRITION_MONTHS):
+        codes = self._group_codes(groups)
+        if start is None:
+            start = np.datetime64(int(self.hire_days.min(initial=self.as_of)), 'D')
+        if end is None:
+            end = np.datetime64(int(self.as_of), 'D')
+
+        months = np.arange(_month(start), _month(end) + 2, dtype='datetime64[M]')
+        boundaries = months.astype('datetime64[D]').astype(np.int64)
+
+        hired_before = self._counts_before(self.hire_days, self.hire_offsets, codes, boundaries)
+        left_before = self._counts_before(self.leave_days, self.leave_offsets, codes, boundaries)
+        headcount = hired_before - left_before
+
+        hires = np.diff(hired_before)
+        leavers = np.diff(left_before)
+        average_headcount = (headcount[:-1] + headcount[1:]) / 2
+
+        rolling_leavers = np.convolve(leavers, np.ones(window, dtype=np.int64))[:len(leavers)]
+        cumulative = np.concatenate([[0.0], np.cumsum(average_headcount)])
+        lagged = np.maximum(np.arange(1, len(leavers) + 1) - window, 0)
+        periods = np.arange(1, len(leavers) + 1) - lagged
+        rolling_headcount = (cumulative[1:] - cumulative[lagged]) / periods
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            series = pd.DataFrame({
+                'headcount': headcount[1:],
+                'hires': hires,
+                'leavers': leavers,
+                'attrition_rate': np.round(leavers / average_headcount * 100, 2),
+                'rolling_attrition_rate': np.round(rolling_leavers / rolling_headcount * 100, 2)
+            }, index=pd.DatetimeIndex(months[:-1].astype('datetime64[ns]'), name='month'))
+        return series
+
+    def kaplan_meier(self, groups=None):
+        codes = self._group_codes(groups)
+        curves = []
+        for code in codes[codes >= 0]:
+            segment = slice(self.tenure_offsets[code], self.tenure_offsets[code + 1])
+            durations = self.tenure_days[segment]
+            if len(durations) == 0:
+                continue
+            events = self.observed[segment]
+
+            times, inverse = np.unique(durations, return_inverse=True)
+            removed = np.bincount(inverse, minlength=len(times))
+            deaths = np.bincount(inverse, weights=events, minlength=len(times)).astype(np.int64)
+            at_risk = len(durations) - np.concatenate([[0], np.cumsum(removed)[:-1]])
+
+            has_events = deaths > 0
+            survival = np.cumprod(1 - deaths[has_events] / at_risk[has_events])
+            curves.append(pd.DataFrame({
+                self.groups.name: self.groups[code],
+                'tenure_days': times[has_events],
+                'tenure_years': np.round(times[has_events] / DAYS_PER_YEAR, 3),
+                'at_risk': at_risk[has_events],
+                'events': deaths[has_events],
+                'survival': survival
+            }))
+
+        if not curves:
+            return pd.DataFrame(columns=[self.groups.name, 'tenure_days', 'tenure_years',
+                                         'at_risk', 'events', 'survival'])
+        return pd.concat(curves, ignore_index=True)
+
+    def median_tenure(self, groups=None):
+        curves = self.kaplan_meier(groups)
+        below = curves[curves['survival'] <= 0.5]
+        medians = below.groupby(self.groups.name, sort=False)['tenure_years'].first()
+        present = curves[self.groups.name].unique()
+        return medians.reindex(present).rename('median_tenure_years')
@@ -0,0 +1,320 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+import numpy as np
+import logging
+from data_processor import DataProcessor
+from predictive_analytics import AttritionPredictor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEPARTMENTS = {
+    'Marketing': (0.159, 0.22, ['Marketing Specialist', 'Brand Manager', 'Digital Marketing Specialist',
+                                'Product Manager', 'Content Manager']),
+    'IT': (0.154, 0.30, ['Data Analyst', 'Software Engineer', 'Full Stack Developer',
+                         'Backend Developer', 'QA Engineer', 'DevOps Engineer']),
+    'HR': (0.151, 0.15, ['Training Specialist', 'HR Manager', 'HR Coordinator',
+                         'HR Specialist', 'Recruiter']),
+    'R&D': (0.149, 0.57, ['Senior Engineer', 'Research Manager', 'Principal Engineer',
+                          'Research Scientist', 'Principal Scientist', 'Research Director',
+                          'Senior Scientist', 'Senior Research Scientist', 'Tech Lead']),
+    'Sales': (0.141, 0.16, ['Sales Manager', 'Sales Representative', 'Account Manager',
+                            'Sales Director']),
+    'Finance': (0.128, 0.24, ['Senior Analyst', 'Accountant', 'Financial Manager',
+                              'Financial Analyst', 'Budget Analyst']),
+    'Operations': (0.118, 0.16, ['Logistics Manager', 'Operations Manager', 'Production Manager',
+                                 'Supply Chain Manager'])
+}
+
+TECHNICAL_DEPARTMENTS = {'IT': 0.52, 'R&D': 0.54}
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+STARTUP_MODULES = ['data_processor', 'predictive_analytics', 'model_tuning', 'visualizations',
+                   'report_export']
+HEAVY_MODULES = ['sklearn', 'matplotlib', 'seaborn', 'plotly', 'joblib', 'duckdb']
+STARTUP_BUDGET_SECONDS = 1.0
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+DASHBOARD_FILTERS = {
+    'department': ['IT', 'R&D', 'Sales'],
+    'gender': ['Female'],
+    'age': (30, 50)
+}
+
+
+def generate_workforce(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    names = list(DEPARTMENTS)
+    shares = np.array([DEPARTMENTS[name][0] for name in names])
+    dept_codes = rng.choice(len(names), size=n_rows, p=shares / shares.sum())
+    department = pd.Categorical.from_codes(dept_codes, categories=names)
+
+    job_title = np.empty(n_rows, dtype=object)
+    technical = np.full(n_rows, 'No', dtype=object)
+    leave_probability = np.empty(n_rows)
+    for code, name in enumerate(names):
+        rows = np.flatnonzero(dept_codes == code)
+        _, attrition_rate, titles = DEPARTMENTS[name]
+        job_title[rows] = rng.choice(titles, size=len(rows))
+        leave_probability[rows] = attrition_rate
+        if name in TECHNICAL_DEPARTMENTS:
+            technical[rows[rng.random(len(rows)) < TECHNICAL_DEPARTMENTS[name]]] = 'Yes'
+
+    attrition = rng.random(n_rows) < leave_probability
+    hire_start = np.datetime64('2010-01-01')
+    hire_offset = rng.integers(0, (np.datetime64('2023-09-09') - hire_start).astype(int), size=n_rows)
+    hire_date = hire_start + hire_offset.astype('timedelta64[D]')
+    tenure = rng.integers(30, 5 * 365, size=n_rows).astype('timedelta64[D]')
+    attrition_date = np.where(attrition, hire_date + tenure, np.datetime64('NaT'))
+
+    employee_id = np.arange(1, n_rows + 1)
+    return pd.DataFrame({
+        'employee_id': employee_id,
+        'first_name': 'Employee' + pd.Series(employee_id).astype(str),
+        'last_name': 'LastName' + pd.Series(employee_id).astype(str),
+        'age': rng.integers(22, 66, size=n_rows),
+        'gender': rng.choice(['Female', 'Male'], size=n_rows, p=[0.503, 0.497]),
+        'department': department,
+        'job_title': job_title,
+        'education': rng.choice(['Master', 'PhD', 'Bachelor'], size=n_rows, p=[0.352, 0.324, 0.324]),
+        'experience_years': rng.integers(1, 21, size=n_rows),
+        'salary': rng.integers(45_000, 150_000, size=n_rows),
+        'attrition': np.where(attrition, 'Yes', 'No'),
+        'attrition_date': attrition_date,
+        'hire_date': hire_date,
+        'technical_background': technical,
+        'performance_rating': rng.integers(1, 6, size=n_rows),
+        'work_life_balance': rng.integers(1, 6, size=n_rows),
+        'overtime': rng.choice(['Yes', 'No'], size=n_rows),
+        'travel_frequently': rng.choice(['Yes', 'No'], size=n_rows, p=[0.524, 0.476]),
+        'training_times_last_year': rng.integers(0, 11, size=n_rows)
+    })
+
+
+def write_workforce(n_rows, path, seed=42, chunk_rows=1_000_000):
+    for offset in range(0, n_rows, chunk_rows):
+        chunk = generate_workforce(min(chunk_rows, n_rows - offset), seed=seed + offset)
+        chunk['employee_id'] += offset
+        chunk.to_csv(path, mode='w' if offset == 0 else 'a', header=offset == 0,
+                     index=False, date_format='%Y-%m-%d')
+    return path
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkRecorder:
+    def __init__(self, size, trace_memory=True):
+        self.size = size
+        self.trace_memory = trace_memory
+        self.records = []
+
+    def measure(self, stage, func):
+        if self.trace_memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        error = None
+        result = None
+        try:
+            result = func()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - start
+
+        peak = None
+        if self.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+
+        record = {
+            'size': self.size,
+            'stage': stage,
+            'seconds': round(elapsed, 6),
+            'rows_per_second': round(self.size / elapsed, 1) if elapsed > 0 else None,
+            'peak_memory_mb': round(peak, 3) if peak is not None else None
+        }
+        if error is not None:
+            record['error'] = error
+        self.records.append(record)
+        logger.info(f"{self.size:>10,} {stage:<40} {elapsed:9.4f}s" + (f"  {error}" if error else ""))
+        return result
+
+    def skip(self, stage, reason):
+        self.records.append({'size': self.size, 'stage': stage, 'skipped': reason})
+
+
+def measure_startup(modules=STARTUP_MODULES, repeats=3, budget=STARTUP_BUDGET_SECONDS):
+    records = []
+    for module in modules:
+        samples = []
+        heavy = []
+        error = None
+        for _ in range(repeats):
+            probe = subprocess.run(
+                [sys.executable, '-c', IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+            )
+            if probe.returncode != 0:
+                error = probe.stderr.strip().splitlines()[-1] if probe.stderr.strip() else 'import failed'
+                break
+            result = json.loads(probe.stdout.strip().splitlines()[-1])
+            samples.append(result['seconds'])
+            heavy = result['heavy']
+
+        record = {'stage': f"import.{module}"}
+        if error is not None:
+            record['error'] = error
+        else:
+            seconds = float(np.median(samples))
+            record.update({
+                'seconds': round(seconds, 6),
+                'budget_seconds': budget,
+                'within_budget': seconds <= budget,
+                'heavy_modules_loaded': heavy
+            })
+        records.append(record)
+        logger.info(f"{'startup':>10} {record['stage']:<40} "
+                    + (f"{record['seconds']:9.4f}s  heavy={heavy}" if error is None else error))
+    return records
+
+
+def benchmark_size(size, workdir, trace_memory=True, max_train_rows=200_000, seed=42):
+    recorder = BenchmarkRecorder(size, trace_memory)
+    csv_path = os.path.join(workdir, f"workforce_{size}.csv")
+    recorder.measure('generate_csv', lambda: write_workforce(size, csv_path, seed=seed))
+
+    cache_dir = os.path.join(workdir, 'cache')
+    processor = DataProcessor(csv_path, cache_dir=cache_dir)
+    df = recorder.measure('load_data.cold', processor.load_data)
+    if df is None:
+        return recorder.records
+    recorder.measure('load_data.warm', DataProcessor(csv_path, cache_dir=cache_dir).load_data)
+
+    compact = DataProcessor(csv_path, cache_dir=cache_dir, compact=True)
+    if recorder.measure('load_data.compact', compact.load_data) is not None:
+        recorder.records.append({
+            'size': size,
+            'stage': 'frame_bytes_per_row',
+            'full': round(processor.memory_report()['bytes_per_row'], 1),
+            'compact': round(compact.memory_report()['bytes_per_row'], 1)
+        })
+
+    publisher = DataProcessor(csv_path, cache_dir=cache_dir, compact=True, shared=True)
+    if recorder.measure('load_data.shared_publish', publisher.load_data) is not None:
+        attached = DataProcessor(csv_path, cache_dir=cache_dir, compact=True, shared=True)
+        recorder.measure('load_data.shared_attach', attached.load_data)
+        publisher.shared.unlink()
+
+    for method in ['get_basic_stats', 'get_department_attrition', 'get_gender_attrition',
+                   'get_technical_attrition', 'get_salary_analysis', 'get_performance_analysis',
+                   'get_worklife_balance_analysis']:
+        recorder.measure(method, getattr(processor, method))
+
+    recorder.measure('get_cube', processor.get_cube)
+    recorder.measure('query.filtered', lambda: processor.query(DASHBOARD_FILTERS))
+
+    if size <= max_train_rows:
+        predictor = AttritionPredictor(df)
+        recorder.measure('train_model', predictor.train_model)
+        recorder.measure('predict_batch', lambda: predictor.predict_batch(df))
+    else:
+        recorder.skip('train_model', f"size exceeds max_train_rows={max_train_rows}")
+        recorder.skip('predict_batch', f"size exceeds max_train_rows={max_train_rows}")
+
+    try:
+        from visualizations import Visualizations
+    except ImportError as e:
+        recorder.skip('figures', f"visualization dependencies unavailable: {e}")
+        return recorder.records
+
+    viz = Visualizations()
+    stats = processor.get_basic_stats()
+    dept = processor.get_department_attrition()
+    gender = processor.get_gender_attrition()
+    tech = processor.get_technical_attrition()
+    histograms = {column: processor.get_histogram(column) for column in ['salary', 'age']}
+    recorder.measure('figure.kpi_cards', lambda: viz.create_kpi_cards(stats))
+    recorder.measure('figure.department_attrition', lambda: viz.plot_department_attrition(dept))
+    recorder.measure('figure.salary_distribution', lambda: viz.plot_salary_distribution(df))
+    recorder.measure(
+        'figure.interactive_dashboard',
+        lambda: viz.create_interactive_dashboard(df, stats, dept, gender, tech, histograms)
+    )
+    return recorder.records
+
+
+def run_benchmarks(sizes, output=None, trace_memory=True, max_train_rows=200_000, seed=42,
+                   startup=True):
+    metadata = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'cpu_count': os.cpu_count()
+    }
+
+    records = []
+    with tempfile.TemporaryDirectory(prefix='hr-benchmark-') as workdir:
+        for size in sizes:
+            records.extend(benchmark_size(size, workdir, trace_memory, max_train_rows, seed))
+
+    report = {'metadata': metadata, 'results': records}
+    if startup:
+        report['startup'] = measure_startup()
+    if output:
+        with open(output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the HR analytics pipeline on synthetic data")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="workforce sizes to generate and benchmark")
+    parser.add_argument('--output', help="write JSON results to this file instead of stdout")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip tracemalloc peak-memory tracking")
+    parser.add_argument('--max-train-rows', type=int, default=200_000,
+                        help="skip model training and scoring above this size")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-startup', action='store_true',
+                        help="skip the cold-import startup budget check")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    run_benchmarks(args.sizes, args.output, not args.no_memory, args.max_train_rows, args.seed,
+                   not args.no_startup)
+
+
+if __name__ == "__main__":
+    main()
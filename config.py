@@ -23,3 +23,121 @@ KPI_METRICS = [
     "average_age",
     "average_salary"
 ]
+
+DATA_CACHE_DIR = "data/.cache"
+
+CATEGORICAL_COLUMNS = [
+    "gender",
+    "department",
+    "job_title",
+    "education",
+    "attrition",
+    "technical_background",
+    "overtime",
+    "travel_frequently"
+]
+
+RATING_COLUMNS = [
+    "performance_rating",
+    "work_life_balance"
+]
+
+DATE_COLUMNS = [
+    "hire_date",
+    "attrition_date"
+]
+
+COMPACT_FRAME = True
+SHARED_DATASET = True
+COMPACT_COLUMNS = [
+    "employee_id",
+    "age",
+    "gender",
+    "department",
+    "experience_years",
+    "salary",
+    "attrition",
+    "attrition_date",
+    "hire_date",
+    "technical_background",
+    "performance_rating",
+    "work_life_balance",
+    "education",
+    "overtime",
+    "travel_frequently"
+]
+BOOLEAN_COLUMNS = [
+    "attrition",
+    "overtime",
+    "travel_frequently"
+]
+
+STREAM_CHUNK_SIZE = 100_000
+QUANTILE_SKETCH_K = 200
+
+CUBE_SALARY_BINS = 20
+HISTOGRAM_BINS = {
+    "salary": 20,
+    "age": 15
+}
+QUERY_CACHE_SIZE = 64
+INCREMENTAL_DELTA_FRACTION = 0.05
+
+SALARY_BAND_EDGES = [60000, 80000, 100000, 120000]
+SALARY_BAND_LABELS = ["Under 60K", "60K-80K", "80K-100K", "100K-120K", "Over 120K"]
+
+ROLLING_ATTRITION_MONTHS = 12
+
+CROSSTAB_MIN_SUPPORT = 10
+CROSSTAB_TOP_SEGMENTS = 15
+
+MODEL_REGISTRY_DIR = "models"
+
+PREDICTION_BATCH_SIZE = 50_000
+RISK_BANDS = ["Low", "Medium", "High"]
+RISK_BAND_THRESHOLDS = [25, 50]
+
+TRAINING_N_JOBS = -1
+WARM_START_ESTIMATORS = 20
+
+TUNING_CV_FOLDS = 5
+TUNING_PARAM_GRID = {
+    "n_estimators": [100, 200],
+    "max_depth": [6, 10, None],
+    "min_samples_leaf": [1, 5]
+}
+
+STORAGE_BACKEND = "pandas"
+SQL_DIR = "sql"
+SQLITE_DATABASE_PATH = "data/.cache/hr_analytics.sqlite"
+DUCKDB_DATABASE_PATH = "data/.cache/hr_analytics.duckdb"
+
+TRACE_ENABLED = False
+TRACE_DIR = "traces"
+
+FIGURE_CACHE_SIZE = 128
+
+REPORT_DIR = "reports"
+REPORT_FORMATS = ["png", "svg", "pdf"]
+
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_WORKERS = None
+API_CACHE_SIZE = 512
+API_BATCH_WINDOW_MS = 5
+API_BATCH_MAX_SIZE = 256
+API_REFRESH_SECONDS = 10
+API_MAX_BODY_BYTES = 10 * 2 ** 20
+
+TABLE_PAGE_SIZE = 50
+TABLE_VIEW_CACHE_SIZE = 4
+TABLE_COLUMNS = [
+    "employee_id",
+    "department",
+    "gender",
+    "age",
+    "salary",
+    "attrition",
+    "technical_background",
+    "performance_rating"
+]
@@ -1,20 +1,273 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from collections import OrderedDict
+import hashlib
+import os
+import threading
 import logging
+import config
+from sql_backend import create_backend
+from tracing import traced
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SCHEMA_VERSION = 3
+
+_query_lock = threading.Lock()
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def attrition_flag(frame):
+    if pd.api.types.is_bool_dtype(frame['attrition']):
+        return frame['attrition'].to_numpy(dtype=np.int8)
+    return (frame['attrition'] == 'Yes').to_numpy(dtype=np.int8)
+
+def build_attrition_table(index, totals, leavers):
+    table = pd.DataFrame({
+        'total_employees': totals,
+        'employees_left': leavers
+    }, index=index)
+    table['attrition_rate'] = (
+        table['employees_left'] / table['total_employees'] * 100
+    ).round(2)
+    return table
+
+def update_sorted(keys, values, removed_keys, removed_values, added_keys, added_values):
+    if len(removed_keys) + len(added_keys) > max(len(keys), 1) * config.INCREMENTAL_DELTA_FRACTION:
+        return None
+    
+    keep = np.ones(len(keys), dtype=bool)
+    starts = np.searchsorted(keys, removed_keys, side='left')
+    stops = np.searchsorted(keys, removed_keys, side='right')
+    for i, (start, stop) in enumerate(zip(starts, stops)):
+        candidates = keep[start:stop]
+        if values is not None:
+            candidates = candidates & (values[start:stop] == removed_values[i])
+        matches = np.flatnonzero(candidates)
+        if len(matches) == 0:
+            return None
+        keep[start + matches[0]] = False
+    
+    order = np.argsort(added_keys, kind='stable')
+    keys = keys[keep]
+    positions = np.searchsorted(keys, added_keys[order], side='right')
+    keys = np.insert(keys, positions, np.asarray(added_keys, dtype=keys.dtype)[order])
+    if values is None:
+        return keys, None
+    values = np.insert(values[keep], positions, np.asarray(added_values, dtype=values.dtype)[order])
+    return keys, values
+
 class DataProcessor:
-    def __init__(self, data_path):
+    def __init__(self, data_path, cache_dir=config.DATA_CACHE_DIR, backend=config.STORAGE_BACKEND,
+                 compact=False, shared=False):
         self.data_path = data_path
+        self.cache_dir = cache_dir
+        self.compact = compact
         self.df = None
+        self.data_version = 0
+        self.shared = None
+        self._snapshot = None
+        if shared:
+            from shared_dataset import SharedDataset
+            self.shared = SharedDataset.for_source(data_path, self._variant())
+        self._source_state = None
+        self._source_digest = None
+        self._backend_stale = False
+        self._ingest_lock = threading.RLock()
+        if backend is None or backend == 'pandas':
+            self.backend = None
+        elif isinstance(backend, str):
+            self.backend = create_backend(backend)
+        else:
+            self.backend = backend
+        self._backend_attached = False
+        self._reset_caches()
+        
+    def _reset_caches(self):
+        self._attrition = None
+        self._codes = {}
+        self._cube = None
+        self._events = None
+        self._crosstab = None
+        self._salary_index = None
+        self._query_cache = OrderedDict()
+        self._sort_orders = {}
+        self._view_cache = OrderedDict()
+        self._histogram_edges = {}
+    
+    def _cache_path(self):
+        if self.cache_dir is None or feather is None:
+            return None
+        
+        source = Path(self.data_path).resolve()
+        stat = source.stat()
+        key = f"{source}:{stat.st_size}:{stat.st_mtime_ns}:{self._schema_key()}"
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return Path(self.cache_dir) / f"{source.stem}.{self._variant()}.{digest}.feather"
+    
+    def _variant(self):
+        return 'compact' if self.compact else 'full'
+    
+    def _schema_key(self):
+        layout = [
+            SCHEMA_VERSION,
+            config.COMPACT_COLUMNS if self.compact else None,
+            config.CATEGORICAL_COLUMNS,
+            config.RATING_COLUMNS,
+            config.DATE_COLUMNS,
+            config.BOOLEAN_COLUMNS if self.compact else None
+        ]
+        return hashlib.sha1(repr(layout).encode()).hexdigest()[:16]
+    
+    def _stat_source(self):
+        stat = Path(self.data_path).stat()
+        return stat.st_size, stat.st_mtime_ns
+    
+    def _read_source(self, path=None):
+        df = pd.read_csv(
+            path or self.data_path,
+            dtype={col: 'category' for col in config.CATEGORICAL_COLUMNS},
+            usecols=(lambda col: col in config.COMPACT_COLUMNS) if self.compact else None
+        )
+        return self._conform(df)
+    
+    def _conform(self, df):
+        if self.compact:
+            df = df[[col for col in df.columns if col in config.COMPACT_COLUMNS]].copy()
+        
+        for col in config.CATEGORICAL_COLUMNS:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+        
+        for col in config.RATING_COLUMNS:
+            if col in df.columns and not df[col].isna().any():
+                df[col] = df[col].astype(np.int8)
+        
+        for col in config.DATE_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col], errors='coerce')
+        
+        if self.compact:
+            for col in config.BOOLEAN_COLUMNS:
+                if col in df.columns and df[col].isin(['Yes', 'No']).all():
+                    df[col] = (df[col] == 'Yes').to_numpy()
+            for col in df.select_dtypes(include='integer').columns:
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+        
+        return df
+    
+    def memory_report(self):
+        if self.df is None:
+            self.load_data()
+        
+        usage = self.df.memory_usage(deep=True, index=False)
+        return {
+            'rows': len(self.df),
+            'total_bytes': int(usage.sum()),
+            'bytes_per_row': usage.sum() / max(len(self.df), 1),
+            'column_bytes': {col: int(size) for col, size in usage.items()}
+        }
+    
+    def _write_cache(self, df, cache_path, digest=None):
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            for stale in cache_path.parent.glob(f"{Path(self.data_path).stem}.{self._variant()}.*.feather"):
+                stale.unlink()
+            
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if digest is not None:
+                table = table.replace_schema_metadata({
+                    **(table.schema.metadata or {}), b'source_digest': digest.encode()
+                })
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, cache_path)
+            logger.info(f"Columnar cache written: {cache_path}")
+        except OSError as e:
+            logger.warning(f"Could not write columnar cache: {str(e)}")
+    
+    def _attach_shared(self, source_state=None):
+        try:
+            snapshot = self.shared.attach()
+        except FileNotFoundError:
+            return False
+        if snapshot is None or snapshot.metadata.get('schema_key') != self._schema_key():
+            return False
+        if source_state is not None and tuple(snapshot.metadata['source_state']) != tuple(source_state):
+            return False
         
+        self.df = snapshot.frame
+        self._snapshot = snapshot
+        self._source_state = tuple(snapshot.metadata['source_state'])
+        self._source_digest = snapshot.metadata['source_digest']
+        self._backend_stale = not snapshot.metadata.get('source_current', True)
+        self._reset_caches()
+        self._backend_attached = False
+        self.data_version = snapshot.generation
+        logger.info(f"Attached shared dataset generation {snapshot.generation}: {len(self.df)} records")
+        return True
+    
+    def _publish_shared(self):
+        try:
+            generation = self.shared.publish(self.df, {
+                'schema_key': self._schema_key(),
+                'source_state': list(self._source_state),
+                'source_digest': self._source_digest,
+                'source_current': not self._backend_stale
+            })
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not publish dataset to shared memory: {str(e)}")
+            return
+        
+        self._snapshot = self.shared.attach(generation)
+        self.df = self._snapshot.frame
+        self.data_version = generation
+    
+    def _shared_stale(self):
+        return (self.shared is not None and self.df is not None
+                and (self._snapshot is None or self.df is not self._snapshot.frame))
+    
+    @traced('DataProcessor.load_data')
     def load_data(self):
         try:
-            self.df = pd.read_csv(self.data_path)
-            logger.info(f"Data loaded successfully: {len(self.df)} records")
+            self._source_state = self._stat_source()
+            if self.shared is not None and self._attach_shared(self._source_state):
+                return self.df
+            cache_path = self._cache_path()
+            if cache_path is not None and cache_path.exists():
+                table = feather.read_table(cache_path, memory_map=True)
+                digest = (table.schema.metadata or {}).get(b'source_digest')
+                self._source_digest = digest.decode() if digest else None
+                self.df = table.to_pandas(split_blocks=True)
+            else:
+                self.df = self._read_source()
+                self._source_digest = file_digest(self.data_path)
+                if cache_path is not None:
+                    self._write_cache(self.df, cache_path, self._source_digest)
+            self._reset_caches()
+            self._backend_attached = False
+            self._backend_stale = False
+            self.data_version += 1
+            if self.shared is not None:
+                self._publish_shared()
+            logger.info(
+                f"Data loaded successfully: {len(self.df)} records "
+                f"({self.memory_report()['bytes_per_row']:.0f} bytes/row, {self._variant()} frame)"
+            )
             return self.df
         except FileNotFoundError:
             logger.error(f"Data file not found: {self.data_path}")
@@ -23,6 +276,7 @@ class DataProcessor:
             logger.error(f"Error loading data: {str(e)}")
             raise
     
+    @traced('DataProcessor.validate_data')
     def validate_data(self):
         if self.df is None:
             raise ValueError("Data not loaded. Call load_data() first.")
@@ -40,93 +294,531 @@ class DataProcessor:
         logger.info("Data validation passed")
         return True
     
+    def source_changed(self):
+        if self._source_state is None:
+            return True
+        
+        state = self._stat_source()
+        if state == self._source_state:
+            return False
+        
+        digest = file_digest(self.data_path)
+        if digest == self._source_digest:
+            self._source_state = state
+            return False
+        return True
+    
+    def _align_categories(self, delta):
+        for col in self.df.columns:
+            if col not in delta.columns or not isinstance(self.df[col].dtype, pd.CategoricalDtype):
+                continue
+            delta_values = delta[col].dropna().unique()
+            categories = self.df[col].cat.categories
+            if not pd.Index(delta_values).isin(categories).all():
+                categories = categories.union(pd.Index(delta_values).astype(categories.dtype))
+                self.df[col] = self.df[col].cat.set_categories(categories)
+            delta[col] = pd.Categorical(delta[col], categories=categories)
+        return delta
+    
+    @traced('DataProcessor.apply_delta')
+    def apply_delta(self, delta, persist=False):
+        with self._ingest_lock:
+            result = self._apply_delta(delta, persist)
+            if self._shared_stale():
+                self._publish_shared()
+            return result
+    
+    def _apply_delta(self, delta, persist):
+        if persist and self.compact:
+            raise ValueError("Cannot persist a compact frame over the full source file")
+        if self.df is None:
+            self.load_data()
+        if isinstance(delta, (str, Path)):
+            delta = self._read_source(delta)
+        else:
+            delta = self._conform(delta.copy())
+        
+        missing = [col for col in self.df.columns if col not in delta.columns]
+        if missing:
+            raise ValueError(f"Delta is missing columns: {missing}")
+        
+        delta = delta.drop_duplicates('employee_id', keep='last')[list(self.df.columns)]
+        self.df = self.df.copy()
+        delta = self._align_categories(delta)
+        for col in self.df.columns:
+            dtypes = (self.df[col].dtype, delta[col].dtype)
+            if dtypes[0] != dtypes[1] and all(isinstance(dtype, np.dtype) for dtype in dtypes):
+                common = np.result_type(*dtypes)
+                self.df[col] = self.df[col].astype(common)
+                delta[col] = delta[col].astype(common)
+        
+        positions = pd.Index(self.df['employee_id']).get_indexer(delta['employee_id'])
+        is_update = positions >= 0
+        removed = self.df.iloc[positions[is_update]]
+        updates = delta[is_update]
+        inserts = delta[~is_update]
+        
+        for col in self.df.columns:
+            self.df.iloc[positions[is_update], self.df.columns.get_loc(col)] = updates[col].to_numpy()
+        if len(inserts):
+            self.df = pd.concat([self.df, inserts], ignore_index=True)
+        
+        changed = {col for col in self.df.columns
+                   if len(inserts) or not removed[col].reset_index(drop=True).equals(updates[col].reset_index(drop=True))}
+        caches = self._delta_caches(positions[is_update], removed, updates, inserts, changed)
+        self._reset_caches()
+        for name, value in caches.items():
+            setattr(self, name, value)
+        self._backend_attached = False
+        self._backend_stale = not persist
+        self.data_version += 1
+        
+        kept = [name.lstrip('_') for name in ('_cube', '_crosstab', '_salary_index', '_events')
+                if caches.get(name) is not None]
+        logger.info(
+            f"Delta applied: {len(updates)} updates, {len(inserts)} inserts "
+            f"(kept up to date: {', '.join(kept) or 'none'})"
+        )
+        if persist:
+            self._persist()
+        return len(updates), len(inserts)
+    
+    def _delta_caches(self, positions, removed, updates, inserts, changed):
+        delta = pd.concat([updates, inserts])
+        caches = {}
+        
+        if self._attrition is not None:
+            flag = self._attrition.copy()
+            flag[positions] = attrition_flag(updates)
+            caches['_attrition'] = np.concatenate([flag, attrition_flag(inserts)])
+        
+        caches['_codes'] = {}
+        for column, (codes, uniques) in self._codes.items():
+            if column not in changed:
+                caches['_codes'][column] = (codes, uniques)
+                continue
+            values = pd.Index(delta[column].to_numpy())
+            delta_codes = uniques.get_indexer(values)
+            if ((delta_codes < 0) & ~values.isna()).any():
+                continue
+            codes = codes.copy()
+            codes[positions] = delta_codes[:len(updates)]
+            caches['_codes'][column] = (np.concatenate([codes, delta_codes[len(updates):]]), uniques)
+        caches['_sort_orders'] = {
+            column: order for column, order in self._sort_orders.items() if column not in changed
+        }
+        
+        if self._cube is not None:
+            from attrition_cube import QueryResult
+            caches['_cube'] = self._cube.apply_delta(removed, delta)
+            if caches['_cube'] is not None:
+                caches['_query_cache'] = OrderedDict(
+                    (key, QueryResult(dict(key), caches['_cube'].select(dict(key))))
+                    for key in self._query_cache
+                )
+        caches['_histogram_edges'] = {
+            key: edges for key, edges in self._histogram_edges.items()
+            if delta[key[0]].dropna().between(edges[0], edges[-1]).all()
+        }
+        
+        if self._crosstab is not None:
+            affected = changed & {'attrition', *self._crosstab.dimensions}
+            caches['_crosstab'] = self._crosstab.apply_delta(removed, delta) if affected else self._crosstab
+        if self._salary_index is not None:
+            affected = changed & {'attrition', 'salary'}
+            caches['_salary_index'] = self._salary_index.apply_delta(removed, delta) if affected else self._salary_index
+        if self._events is not None:
+            affected = changed & {'attrition', 'hire_date', 'attrition_date', self._events.groups.name}
+            caches['_events'] = self._events.apply_delta(removed, delta) if affected else self._events
+        return caches
+    
+    def _persist(self):
+        source = Path(self.data_path)
+        tmp_path = source.with_suffix(f".{os.getpid()}.tmp")
+        self.df.to_csv(tmp_path, index=False, date_format='%Y-%m-%d')
+        os.replace(tmp_path, source)
+        
+        self._source_state = self._stat_source()
+        self._source_digest = file_digest(source)
+        self._backend_stale = False
+        cache_path = self._cache_path()
+        if cache_path is not None:
+            self._write_cache(self.df, cache_path, self._source_digest)
+    
+    def sync_shared(self):
+        if self._snapshot is None or self.shared.generation() == self._snapshot.generation:
+            return False
+        with self._ingest_lock:
+            return self._attach_shared()
+    
+    @traced('DataProcessor.refresh')
+    def refresh(self):
+        with self._ingest_lock:
+            if self.sync_shared():
+                return True
+            changed = self._refresh()
+            if self._shared_stale():
+                self._publish_shared()
+            return changed
+    
+    def _refresh(self):
+        if self.df is None:
+            self.load_data()
+            return True
+        if not self.source_changed():
+            return False
+        
+        current = self._read_source()
+        digest = file_digest(self.data_path)
+        state = self._stat_source()
+        
+        ids = pd.Index(current['employee_id'])
+        if (list(current.columns) != list(self.df.columns) or not ids.is_unique
+                or not pd.Index(self.df['employee_id']).isin(ids).all()):
+            logger.info("Source schema changed or rows were removed; reloading in full")
+            return self.load_data() is not None
+        
+        positions = pd.Index(self.df['employee_id']).get_indexer(ids)
+        existing = positions >= 0
+        changed = ~existing
+        changed[existing] = (
+            pd.util.hash_pandas_object(current[existing], index=False).to_numpy()
+            != pd.util.hash_pandas_object(self.df.iloc[positions[existing]], index=False).to_numpy()
+        )
+        if changed.any():
+            self._apply_delta(current[changed], persist=False)
+        
+        self._source_state = state
+        self._source_digest = digest
+        self._backend_stale = False
+        cache_path = self._cache_path()
+        if cache_path is not None:
+            self._write_cache(self.df, cache_path, digest)
+        return bool(changed.any())
+    
+    def _use_backend(self):
+        return self.backend is not None and not self._backend_stale
+    
+    def _sql(self):
+        if not self._backend_attached:
+            self.backend.attach(self.data_path)
+            self._backend_attached = True
+        return self.backend
+    
+    @traced('DataProcessor.get_basic_stats')
     def get_basic_stats(self):
+        if self._use_backend():
+            return self._sql().get_basic_stats()
         if self.df is None:
             self.load_data()
         
         stats = {
             'total_employees': len(self.df),
-            'attrition_rate': (self.df['attrition'] == 'Yes').mean() * 100,
+            'attrition_rate': self._attrition_flag().mean() * 100,
             'average_age': self.df['age'].mean(),
             'average_salary': self.df['salary'].mean()
         }
         return stats
     
-    def get_department_attrition(self):
-        dept_attrition = self.df.groupby('department').agg({
-            'employee_id': 'count',
-            'attrition': lambda x: (x == 'Yes').sum()
-        }).rename(columns={'employee_id': 'total_employees', 'attrition': 'employees_left'})
+    def _attrition_flag(self):
+        if self._attrition is None:
+            self._attrition = attrition_flag(self.df)
+        return self._attrition
+    
+    def _column_codes(self, column):
+        if column not in self._codes:
+            codes, uniques = pd.factorize(self.df[column], sort=True)
+            if isinstance(uniques, pd.CategoricalIndex):
+                uniques = uniques.astype(uniques.categories.dtype)
+            self._codes[column] = (codes, uniques)
+        return self._codes[column]
+    
+    @traced('DataProcessor.get_attrition_breakdown')
+    def get_attrition_breakdown(self, dimensions):
+        if self.df is None:
+            self.load_data()
+        if isinstance(dimensions, str):
+            dimensions = [dimensions]
+        
+        flag = self._attrition_flag()
+        combined = np.zeros(len(self.df), dtype=np.int64)
+        valid = None
+        levels = []
+        for dim in dimensions:
+            codes, uniques = self._column_codes(dim)
+            if (codes < 0).any():
+                valid = codes >= 0 if valid is None else valid & (codes >= 0)
+            combined = combined * len(uniques) + codes
+            levels.append(uniques)
+        
+        if valid is not None:
+            combined = combined[valid]
+            flag = flag[valid]
+        
+        shape = tuple(len(level) for level in levels)
+        size = int(np.prod(shape))
+        totals = np.bincount(combined, minlength=size)
+        leavers = np.bincount(combined, weights=flag, minlength=size).astype(np.int64)
+        present = np.flatnonzero(totals)
+        
+        if len(dimensions) == 1:
+            index = levels[0][present].rename(dimensions[0])
+        else:
+            positions = np.unravel_index(present, shape)
+            index = pd.MultiIndex.from_arrays(
+                [level[pos] for level, pos in zip(levels, positions)],
+                names=dimensions
+            )
+        
+        return build_attrition_table(index, totals[present], leavers[present])
+    
+    @traced('DataProcessor.get_cube')
+    def get_cube(self):
+        if self.df is None:
+            self.load_data()
+        if self._cube is None:
+            from attrition_cube import AttritionCube
+            self._cube = AttritionCube.from_processor(self)
+        return self._cube
+    
+    @traced('DataProcessor.get_event_index')
+    def get_event_index(self):
+        if self.df is None:
+            self.load_data()
+        if self._events is None:
+            from attrition_timeseries import EventIndex
+            self._events = EventIndex.from_processor(self)
+        return self._events
+    
+    @traced('DataProcessor.get_attrition_timeseries')
+    def get_attrition_timeseries(self, departments=None, start=None, end=None,
+                                 window=config.ROLLING_ATTRITION_MONTHS):
+        return self.get_event_index().monthly_series(departments, start, end, window)
+    
+    @traced('DataProcessor.get_tenure_survival')
+    def get_tenure_survival(self, departments=None):
+        return self.get_event_index().kaplan_meier(departments)
+    
+    def get_crosstab_engine(self):
+        if self.df is None:
+            self.load_data()
+        if self._crosstab is None:
+            from attrition_crosstab import CrossTabEngine
+            self._crosstab = CrossTabEngine.from_processor(self)
+        return self._crosstab
+    
+    @traced('DataProcessor.get_crosstab')
+    def get_crosstab(self, dimensions, min_support=config.CROSSTAB_MIN_SUPPORT):
+        return self.get_crosstab_engine().crosstab(dimensions, min_support)
+    
+    @traced('DataProcessor.get_attrition_segments')
+    def get_attrition_segments(self, orders=(2, 3), min_support=config.CROSSTAB_MIN_SUPPORT, top=None):
+        segments = self.get_crosstab_engine().segments(orders, min_support)
+        return segments if top is None else segments.head(top)
+    
+    @traced('DataProcessor.get_salary_index')
+    def get_salary_index(self):
+        if self.df is None:
+            self.load_data()
+        if self._salary_index is None:
+            from salary_index import SalaryIndex
+            self._salary_index = SalaryIndex.from_processor(self)
+        return self._salary_index
+    
+    @traced('DataProcessor.get_salary_quantiles')
+    def get_salary_quantiles(self, quantiles):
+        return self.get_salary_index().quantile(quantiles)
+    
+    @traced('DataProcessor.get_salary_bands')
+    def get_salary_bands(self, edges=None, labels=None):
+        if edges is None and labels is None:
+            labels = config.SALARY_BAND_LABELS
+        return self.get_salary_index().band_stats(edges, labels)
+    
+    @traced('DataProcessor.get_salary_range_attrition')
+    def get_salary_range_attrition(self, low=None, high=None):
+        return self.get_salary_index().range_stats(low, high)
+    
+    @traced('DataProcessor.query')
+    def query(self, filters=None):
+        from attrition_cube import QueryResult, normalize_filters, filter_covers
         
-        dept_attrition['attrition_rate'] = (
-            dept_attrition['employees_left'] / dept_attrition['total_employees'] * 100
-        ).round(2)
+        cube = self.get_cube()
+        version = self.data_version
+        key = normalize_filters(filters or {}, cube.levels)
+        with _query_lock:
+            if key in self._query_cache:
+                self._query_cache.move_to_end(key)
+                return self._query_cache[key]
+            
+            base = cube
+            for cached_key, cached in self._query_cache.items():
+                if filter_covers(cached_key, key) and len(cached.cube.cells) < len(base.cells):
+                    base = cached.cube
         
+        result = QueryResult(dict(key), base.select(dict(key)))
+        with _query_lock:
+            if self._cube is cube and self.data_version == version:
+                self._query_cache[key] = result
+                if len(self._query_cache) > config.QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+        
+        return result
+    
+    def histogram_edges(self, column, bins=None):
+        if self.df is None:
+            self.load_data()
+        bins = bins or config.HISTOGRAM_BINS[column]
+        if (column, bins) not in self._histogram_edges:
+            values = self.df[column].to_numpy(dtype=np.float64)
+            self._histogram_edges[(column, bins)] = np.histogram_bin_edges(values[~np.isnan(values)], bins=bins)
+        return self._histogram_edges[(column, bins)]
+    
+    @traced('DataProcessor.get_histogram')
+    def get_histogram(self, column, bins=None, filters=None):
+        from attrition_cube import normalize_filters
+        
+        edges = self.histogram_edges(column, bins)
+        result = self.query(filters)
+        counts = result.cube.histogram(column, edges)
+        if counts is None:
+            values = self.df[column].to_numpy(dtype=np.float64)
+            mask = self._row_mask(normalize_filters(filters or {}, result.cube.levels))
+            mask &= ~np.isnan(values)
+            counts, _ = np.histogram(values[mask], bins=edges)
+        return counts, edges
+    
+    def _row_mask(self, key):
+        mask = np.ones(len(self.df), dtype=bool)
+        for dim, selection in key:
+            codes, uniques = self._column_codes(dim)
+            if isinstance(selection, tuple):
+                allowed = np.asarray((uniques >= selection[0]) & (uniques <= selection[1]))
+            else:
+                allowed = np.asarray(uniques.isin(list(selection)))
+            mask &= (codes >= 0) & allowed[codes]
+        return mask
+    
+    def _search_mask(self, search, columns):
+        mask = np.zeros(len(self.df), dtype=bool)
+        needle = search.strip().lower()
+        for col in columns:
+            series = self.df[col]
+            if pd.api.types.is_bool_dtype(series):
+                if needle in 'yes':
+                    mask |= series.to_numpy()
+                if needle in 'no':
+                    mask |= ~series.to_numpy()
+            elif pd.api.types.is_numeric_dtype(series):
+                try:
+                    mask |= (series == float(needle)).to_numpy()
+                except ValueError:
+                    pass
+            else:
+                codes, uniques = self._column_codes(col)
+                allowed = np.asarray(uniques.astype(str).str.lower().str.contains(needle, regex=False))
+                mask |= (codes >= 0) & allowed[codes]
+        return mask
+    
+    def _sort_order(self, column):
+        if column not in self._sort_orders:
+            codes, _ = self._column_codes(column)
+            self._sort_orders[column] = np.argsort(codes, kind='stable')
+        return self._sort_orders[column]
+    
+    @traced('DataProcessor.get_page')
+    def get_page(self, filters=None, page=0, page_size=config.TABLE_PAGE_SIZE, sort_by=None,
+                 ascending=True, search=None, columns=None):
+        from attrition_cube import normalize_filters
+        
+        if self.df is None:
+            self.load_data()
+        columns = [col for col in (columns or config.TABLE_COLUMNS) if col in self.df.columns]
+        df = self.df
+        version = self.data_version
+        key = normalize_filters(filters or {}, self.get_cube().levels)
+        search = (search or '').strip() or None
+        view_key = (key, search, sort_by, ascending)
+        
+        with _query_lock:
+            positions = self._view_cache.get(view_key)
+            if positions is not None:
+                self._view_cache.move_to_end(view_key)
+        
+        if positions is None:
+            order = self._sort_order(sort_by) if sort_by else None
+            if key or search:
+                mask = self._row_mask(key)
+                if search:
+                    mask &= self._search_mask(search, columns)
+                positions = np.flatnonzero(mask) if order is None else order[mask[order]]
+            else:
+                positions = np.arange(len(self.df)) if order is None else order
+            if not ascending:
+                positions = positions[::-1]
+            
+            with _query_lock:
+                if self.df is df and self.data_version == version:
+                    self._view_cache[view_key] = positions
+                    if len(self._view_cache) > config.TABLE_VIEW_CACHE_SIZE:
+                        self._view_cache.popitem(last=False)
+        
+        start = page * page_size
+        page_df = df.iloc[positions[start:start + page_size]][columns]
+        for col in page_df.columns:
+            if pd.api.types.is_bool_dtype(page_df[col]):
+                page_df[col] = np.where(page_df[col], 'Yes', 'No')
+        return page_df, len(positions)
+    
+    @traced('DataProcessor.get_department_attrition')
+    def get_department_attrition(self):
+        if self._use_backend():
+            return self._sql().get_department_attrition()
+        
+        dept_attrition = self.get_attrition_breakdown('department')
         return dept_attrition.sort_values('attrition_rate', ascending=False)
     
+    @traced('DataProcessor.get_gender_attrition')
     def get_gender_attrition(self):
-        gender_attrition = self.df.groupby('gender').agg({
-            'employee_id': 'count',
-            'attrition': lambda x: (x == 'Yes').sum()
-        }).rename(columns={'employee_id': 'total_employees', 'attrition': 'employees_left'})
-        
-        gender_attrition['attrition_rate'] = (
-            gender_attrition['employees_left'] / gender_attrition['total_employees'] * 100
-        ).round(2)
+        if self._use_backend():
+            return self._sql().get_gender_attrition()
         
-        return gender_attrition
+        return self.get_attrition_breakdown('gender')
     
+    @traced('DataProcessor.get_technical_attrition')
     def get_technical_attrition(self):
-        tech_attrition = self.df.groupby('technical_background').agg({
-            'employee_id': 'count',
-            'attrition': lambda x: (x == 'Yes').sum()
-        }).rename(columns={'employee_id': 'total_employees', 'attrition': 'employees_left'})
+        if self._use_backend():
+            return self._sql().get_technical_attrition()
         
-        tech_attrition['attrition_rate'] = (
-            tech_attrition['employees_left'] / tech_attrition['total_employees'] * 100
-        ).round(2)
-        
-        return tech_attrition
+        return self.get_attrition_breakdown('technical_background')
     
+    @traced('DataProcessor.get_salary_analysis')
     def get_salary_analysis(self):
-        salary_stats = {
-            'mean': self.df['salary'].mean(),
-            'median': self.df['salary'].median(),
-            'min': self.df['salary'].min(),
-            'max': self.df['salary'].max(),
-            'std': self.df['salary'].std()
-        }
+        if self._use_backend():
+            return self._sql().get_salary_analysis()
         
-        salary_by_attrition = self.df.groupby('attrition')['salary'].agg(['mean', 'median', 'count'])
+        index = self.get_salary_index()
+        salary_stats = dict(index.summary)
+        salary_by_attrition = index.by_attrition
         
         return salary_stats, salary_by_attrition
     
+    @traced('DataProcessor.get_performance_analysis')
     def get_performance_analysis(self):
+        if self._use_backend():
+            return self._sql().get_performance_analysis()
+        
         if 'performance_rating' not in self.df.columns:
             return None
         
-        perf_attrition = self.df.groupby('performance_rating').agg({
-            'employee_id': 'count',
-            'attrition': lambda x: (x == 'Yes').sum()
-        }).rename(columns={'employee_id': 'total_employees', 'attrition': 'employees_left'})
-        
-        perf_attrition['attrition_rate'] = (
-            perf_attrition['employees_left'] / perf_attrition['total_employees'] * 100
-        ).round(2)
-        
-        return perf_attrition.sort_index()
+        return self.get_attrition_breakdown('performance_rating').sort_index()
     
+    @traced('DataProcessor.get_worklife_balance_analysis')
     def get_worklife_balance_analysis(self):
+        if self._use_backend():
+            return self._sql().get_worklife_balance_analysis()
+        
         if 'work_life_balance' not in self.df.columns:
             return None
         
-        wlb_attrition = self.df.groupby('work_life_balance').agg({
-            'employee_id': 'count',
-            'attrition': lambda x: (x == 'Yes').sum()
-        }).rename(columns={'employee_id': 'total_employees', 'attrition': 'employees_left'})
-        
-        wlb_attrition['attrition_rate'] = (
-            wlb_attrition['employees_left'] / wlb_attrition['total_employees'] * 100
-        ).round(2)
-        
-        return wlb_attrition.sort_index()
+        return self.get_attrition_breakdown('work_life_balance').sort_index()
@@ -0,0 +1,136 @@
+import pandas as pd
+import numpy as np
+import functools
+import hashlib
+import json
+import pickle
+import threading
+from collections import OrderedDict
+import logging
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _update_digest(digest, value):
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        digest.update(type(value).__name__.encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(value.columns)).encode())
+        else:
+            digest.update(repr(value.name).encode())
+        hashed = pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index))
+        digest.update(hashed.to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _update_digest(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+
+def style_signature():
+    return json.dumps({'colors': config.COLORS, 'chart_style': config.CHART_STYLE},
+                      sort_keys=True, default=str)
+
+
+def figure_key(name, *inputs, **options):
+    digest = hashlib.sha1(name.encode())
+    digest.update(style_signature().encode())
+    _update_digest(digest, inputs)
+    _update_digest(digest, options)
+    return digest.hexdigest()
+
+
+def _close(fig):
+    if hasattr(fig, 'savefig'):
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+
+
+def _serialize(fig):
+    if hasattr(fig, 'to_plotly_json'):
+        return 'plotly', fig.to_json()
+    payload = pickle.dumps(fig)
+    _close(fig)
+    return 'pickle', payload
+
+
+def _deserialize(kind, payload):
+    if kind == 'plotly':
+        import plotly.io as pio
+        return pio.from_json(payload)
+    fig = pickle.loads(payload)
+    _close(fig)
+    return fig
+
+
+class FigureCache:
+    def __init__(self, maxsize=config.FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, name, build, *inputs, key_inputs=None, **options):
+        key = figure_key(name, *(inputs if key_inputs is None else key_inputs), **options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            return _deserialize(*entry)
+
+        fig = build(*inputs, **options)
+        try:
+            entry = _serialize(fig)
+        except Exception as e:
+            logger.warning(f"Figure {name} could not be serialized for caching: {e}")
+            return fig
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+shared_figure_cache = FigureCache()
+
+
+def cached_figure(name, key_inputs=None):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'figure_cache', None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+            return cache.get_or_build(
+                name, functools.partial(func, self), *args,
+                key_inputs=None if key_inputs is None else key_inputs(*args, **kwargs), **kwargs
+            )
+
+        return wrapper
+
+    return decorator
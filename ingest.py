@@ -0,0 +1,27 @@
+import argparse
+import logging
+import config
+from data_processor import DataProcessor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Apply HRIS delta files (inserts and updates keyed on employee_id) to the dataset"
+    )
+    parser.add_argument('deltas', nargs='+', help="delta CSV files, applied in order")
+    parser.add_argument('--data', default=config.DATA_PATH, help="dataset CSV to update in place")
+    args = parser.parse_args(argv)
+
+    processor = DataProcessor(args.data)
+    processor.load_data()
+    processor.get_cube()
+    for path in args.deltas:
+        updates, inserts = processor.apply_delta(path, persist=True)
+        logger.info(f"{path}: {updates} updates, {inserts} inserts")
+
+
+if __name__ == "__main__":
+    main()
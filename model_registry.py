@@ -0,0 +1,84 @@
+import pandas as pd
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+import logging
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 2
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def dataset_fingerprint(df):
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(','.join(df.columns).encode())
+    return digest.hexdigest()[:16]
+
+
+class ModelRegistry:
+    def __init__(self, directory=config.MODEL_REGISTRY_DIR):
+        self.directory = Path(directory)
+
+    def key(self, fingerprint, params):
+        params_digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+        return f"{fingerprint}-{params_digest}-v{ARTIFACT_VERSION}"
+
+    def path(self, key):
+        return self.directory / f"{key}.joblib"
+
+    def exists(self, key):
+        return self.path(key).exists()
+
+    def load(self, key):
+        path = self.path(key)
+        with _lock:
+            if path in _loaded:
+                return _loaded[path]
+            if not path.exists():
+                return None
+
+            import joblib
+            artifacts = joblib.load(path, mmap_mode='r')
+            _loaded[path] = artifacts
+            logger.info(f"Model loaded from registry: {path}")
+            return artifacts
+
+    def save(self, key, artifacts):
+        path = self.path(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        import joblib
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        joblib.dump(artifacts, tmp_path)
+        os.replace(tmp_path, path)
+
+        with _lock:
+            _loaded[path] = artifacts
+        logger.info(f"Model saved to registry: {path}")
+        return path
+
+    def published_path(self, fingerprint):
+        return self.directory / f"{fingerprint}.published.json"
+
+    def publish(self, fingerprint, params):
+        path = self.published_path(fingerprint)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(params, sort_keys=True))
+        os.replace(tmp_path, path)
+        logger.info(f"Published model parameters for {fingerprint}: {params}")
+
+    def published_params(self, fingerprint):
+        path = self.published_path(fingerprint)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
@@ -0,0 +1,129 @@
+import pandas as pd
+import numpy as np
+import itertools
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import config
+from model_registry import ModelRegistry
+from predictive_analytics import AttritionPredictor, FeatureEncoder
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_background = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-tuning')
+
+_worker_X = None
+_worker_y = None
+_worker_folds = None
+
+
+def _init_worker(x_path, y_path, n_splits, random_state):
+    from sklearn.model_selection import StratifiedKFold
+    
+    global _worker_X, _worker_y, _worker_folds
+    _worker_X = np.load(x_path, mmap_mode='r')
+    _worker_y = np.load(y_path, mmap_mode='r')
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    _worker_folds = list(splitter.split(np.zeros(len(_worker_y)), _worker_y))
+
+
+def _evaluate(params, fold):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import accuracy_score, roc_auc_score
+    
+    train_idx, test_idx = _worker_folds[fold]
+    model = RandomForestClassifier(class_weight='balanced', n_jobs=1, **params)
+    model.fit(_worker_X[train_idx], _worker_y[train_idx])
+
+    probability = model.predict_proba(_worker_X[test_idx])[:, 1]
+    y_test = _worker_y[test_idx]
+    return {
+        'roc_auc': roc_auc_score(y_test, probability),
+        'accuracy': accuracy_score(y_test, (probability > 0.5).astype(int))
+    }
+
+
+def _native(value):
+    if pd.isna(value):
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def parameter_grid(grid):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def tune_hyperparameters(df, param_grid=None, n_splits=config.TUNING_CV_FOLDS,
+                         n_workers=None, random_state=42, registry=None, publish=True):
+    candidates = parameter_grid(param_grid or config.TUNING_PARAM_GRID)
+    n_workers = n_workers or os.cpu_count()
+
+    start = time.perf_counter()
+    encoder = FeatureEncoder().fit(df)
+    X = encoder.transform(df).to_numpy(dtype=np.float32)
+    y = encoder.target(df).to_numpy()
+
+    workdir = tempfile.mkdtemp(prefix='hr-tuning-')
+    try:
+        x_path = os.path.join(workdir, 'X.npy')
+        y_path = os.path.join(workdir, 'y.npy')
+        np.save(x_path, X)
+        np.save(y_path, y)
+        del X
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(x_path, y_path, n_splits, random_state)
+        ) as pool:
+            tasks = [
+                (index, pool.submit(_evaluate, {**params, 'random_state': random_state}, fold))
+                for index, params in enumerate(candidates)
+                for fold in range(n_splits)
+            ]
+            scores = [(index, task.result()) for index, task in tasks]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = pd.DataFrame([
+        {**candidates[index], **score} for index, score in scores
+    ])
+    param_cols = sorted(candidates[0])
+    results = (
+        results.groupby(param_cols, dropna=False)
+        .agg(roc_auc=('roc_auc', 'mean'), roc_auc_std=('roc_auc', 'std'), accuracy=('accuracy', 'mean'))
+        .reset_index()
+        .sort_values('roc_auc', ascending=False)
+        .reset_index(drop=True)
+    )
+
+    best_params = {key: _native(value) for key, value in results.iloc[0][param_cols].items()}
+    logger.info(
+        f"Tuned {len(candidates)} candidates x {n_splits} folds in "
+        f"{time.perf_counter() - start:.1f}s; best {best_params} "
+        f"(roc_auc={results.iloc[0]['roc_auc']:.4f})"
+    )
+
+    predictor = None
+    if publish:
+        registry = registry or ModelRegistry()
+        predictor = AttritionPredictor(df, random_state=random_state, **best_params)
+        predictor.train_model()
+        predictor.publish(registry)
+
+    return results, best_params, predictor
+
+
+def start_tuning_job(df, **kwargs):
+    return _background.submit(tune_hyperparameters, df, **kwargs)
@@ -1,95 +1,345 @@
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
+import copy
 import logging
+import threading
+import time
+import config
+from data_processor import attrition_flag
+from model_registry import ModelRegistry, dataset_fingerprint
+from tracing import traced
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CATEGORICAL_FEATURES = ['gender', 'department', 'technical_background']
+
+FEATURE_COLUMNS = ['age', 'gender', 'department', 'experience_years',
+                   'salary', 'technical_background', 'performance_rating',
+                   'work_life_balance']
+
+class FeatureEncoder:
+    def __init__(self):
+        self.categories = {}
+        self.feature_cols = None
+    
+    def fit(self, df):
+        self.feature_cols = [col for col in FEATURE_COLUMNS if col in df.columns]
+        for col in CATEGORICAL_FEATURES:
+            if col not in df.columns:
+                continue
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                self.categories[col] = df[col].cat.categories
+            else:
+                self.categories[col] = pd.Categorical(df[col].astype(str)).categories
+        return self
+    
+    def _codes(self, series, categories):
+        if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.categories.equals(categories):
+            codes = series.cat.codes.to_numpy()
+        else:
+            codes = pd.Categorical(series.astype(str), categories=categories).codes
+        
+        if (codes < 0).any():
+            unseen = sorted(set(series.astype(str)[codes < 0]))
+            raise ValueError(f"Unseen values for {series.name}: {unseen}")
+        return codes
+    
+    def transform(self, df):
+        X = pd.DataFrame(index=df.index)
+        for col in self.feature_cols:
+            if col in self.categories:
+                X[col] = self._codes(df[col], self.categories[col])
+            else:
+                X[col] = df[col].to_numpy()
+        return X
+    
+    def target(self, df):
+        return pd.Series(attrition_flag(df), index=df.index, name='attrition')
+
+def _row_ids(df):
+    ids = df['employee_id'] if 'employee_id' in df.columns else df.index.to_series()
+    return pd.Series(ids.to_numpy(), index=df.index)
+
 class AttritionPredictor:
-    def __init__(self, df):
-        self.df = df.copy()
+    def __init__(self, df, n_estimators=100, max_depth=10, random_state=42,
+                 min_samples_leaf=1, n_jobs=config.TRAINING_N_JOBS):
+        self.df = df
         self.model = None
-        self.label_encoders = {}
+        self.encoder = None
         self.feature_importance = None
+        self.feature_cols = None
+        self.accuracy = None
+        self.report = None
+        self.params = {
+            'n_estimators': n_estimators,
+            'max_depth': max_depth,
+            'min_samples_leaf': min_samples_leaf,
+            'random_state': random_state
+        }
+        self.n_jobs = n_jobs
+        self.training_timings = {}
+        self.trained_ids = None
+        self.held_out_ids = None
+        self._fingerprint = None
+        self._registry_key = None
+        self.last_batch_throughput = None
+        self._lock = threading.Lock()
         
+    @traced('AttritionPredictor.prepare_data')
     def prepare_data(self):
-        df = self.df.copy()
+        if self.encoder is None:
+            self.encoder = FeatureEncoder().fit(self.df)
+        
+        X = self.encoder.transform(self.df)
+        y = self.encoder.target(self.df)
+        
+        return X, y, self.encoder.feature_cols
+    
+    def _split(self, X, y, timings):
+        from sklearn.model_selection import train_test_split
         
-        categorical_cols = ['gender', 'department', 'technical_background']
-        if 'job_title' in df.columns:
-            categorical_cols.append('job_title')
+        start = time.perf_counter()
+        split = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
+        timings['split'] = time.perf_counter() - start
+        return split
+    
+    def _holdout_split(self, X, y, row_ids, seed, timings):
+        start = time.perf_counter()
+        held_out = row_ids.isin(self.held_out_ids).to_numpy().copy()
+        new = ~held_out & ~row_ids.isin(self.trained_ids).to_numpy()
         
-        for col in categorical_cols:
-            if col in df.columns:
-                le = LabelEncoder()
-                df[col] = le.fit_transform(df[col].astype(str))
-                self.label_encoders[col] = le
+        positions = np.flatnonzero(new)
+        rng = np.random.default_rng(seed)
+        held_out[rng.permutation(positions)[:int(round(len(positions) * 0.2))]] = True
+        if not held_out.any():
+            raise ValueError("No held-out rows left to evaluate the update on")
         
-        df['attrition_binary'] = (df['attrition'] == 'Yes').astype(int)
+        timings['split'] = time.perf_counter() - start
+        return X[~held_out], X[held_out], y[~held_out], y[held_out]
+    
+    def _fit_and_evaluate(self, model, encoder, X_train, X_test, y_train, y_test, row_ids,
+                          trained_ids, timings, sample_weight=None):
+        from sklearn.metrics import accuracy_score, classification_report
         
-        feature_cols = ['age', 'gender', 'department', 'experience_years', 
-                       'salary', 'technical_background']
+        start = time.perf_counter()
+        model.fit(X_train, y_train, sample_weight=sample_weight)
+        timings['fit'] = time.perf_counter() - start
         
-        if 'performance_rating' in df.columns:
-            feature_cols.append('performance_rating')
-        if 'work_life_balance' in df.columns:
-            feature_cols.append('work_life_balance')
+        start = time.perf_counter()
+        y_pred = model.predict(X_test)
+        accuracy = accuracy_score(y_test, y_pred)
+        report = classification_report(y_test, y_pred)
+        timings['evaluate'] = time.perf_counter() - start
         
-        available_cols = [col for col in feature_cols if col in df.columns]
+        logger.info(f"Model trained with accuracy: {accuracy:.4f}")
+        logger.info(
+            "Training timings: " +
+            ", ".join(f"{phase}={seconds:.3f}s" for phase, seconds in timings.items())
+        )
         
-        X = df[available_cols]
-        y = df['attrition_binary']
+        self._swap({
+            'model': model,
+            'encoder': encoder,
+            'feature_cols': encoder.feature_cols,
+            'feature_importance': pd.DataFrame({
+                'feature': encoder.feature_cols,
+                'importance': model.feature_importances_
+            }).sort_values('importance', ascending=False),
+            'accuracy': accuracy,
+            'report': report,
+            'training_timings': timings,
+            'trained_ids': trained_ids.union(row_ids.loc[X_train.index]),
+            'held_out_ids': pd.Index(row_ids.loc[X_test.index])
+        })
         
-        return X, y, available_cols
+        return accuracy, report
+    
+    def _swap(self, state):
+        with self._lock:
+            for name, value in state.items():
+                setattr(self, name, value)
     
+    def _fitted(self):
+        with self._lock:
+            if self.model is None:
+                raise ValueError("Model not trained. Call train_model() first.")
+            return self.model, self.encoder
+    
+    @traced('AttritionPredictor.train_model')
     def train_model(self):
-        X, y, feature_cols = self.prepare_data()
+        from sklearn.ensemble import RandomForestClassifier
         
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
+        timings = {}
+        
+        start = time.perf_counter()
+        encoder = FeatureEncoder().fit(self.df)
+        X = encoder.transform(self.df)
+        y = encoder.target(self.df)
+        timings['prepare'] = time.perf_counter() - start
+        
+        model = RandomForestClassifier(
+            n_estimators=self.params['n_estimators'],
+            max_depth=self.params['max_depth'],
+            min_samples_leaf=self.params['min_samples_leaf'],
+            random_state=self.params['random_state'],
+            class_weight='balanced',
+            n_jobs=self.n_jobs
         )
         
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42,
-            class_weight='balanced'
+        return self._fit_and_evaluate(
+            model, encoder, *self._split(X, y, timings), _row_ids(self.df), pd.Index([]), timings
         )
+    
+    @traced('AttritionPredictor.update_model')
+    def update_model(self, df=None, additional_estimators=config.WARM_START_ESTIMATORS,
+                     refresh_estimators=0):
+        from sklearn.utils.class_weight import compute_sample_weight
         
-        self.model.fit(X_train, y_train)
+        current, encoder = self._fitted()
+        if self.trained_ids is None:
+            raise ValueError("Model has no record of its training rows; retrain it with train_model()")
         
-        y_pred = self.model.predict(X_test)
-        accuracy = accuracy_score(y_test, y_pred)
+        if df is not None:
+            self.df = df
+            self._fingerprint = None
         
-        logger.info(f"Model trained with accuracy: {accuracy:.4f}")
+        timings = {}
+        
+        start = time.perf_counter()
+        X = encoder.transform(self.df)
+        y = encoder.target(self.df)
+        timings['prepare'] = time.perf_counter() - start
+        
+        model = copy.deepcopy(current)
+        seed = int(np.random.SeedSequence(
+            [model.random_state or 0, len(model.estimators_), refresh_estimators, additional_estimators]
+        ).generate_state(1)[0])
+        X_train, X_test, y_train, y_test = self._holdout_split(X, y, _row_ids(self.df), seed, timings)
         
-        self.feature_importance = pd.DataFrame({
-            'feature': feature_cols,
-            'importance': self.model.feature_importances_
-        }).sort_values('importance', ascending=False)
+        if refresh_estimators:
+            model.estimators_ = model.estimators_[refresh_estimators:]
         
-        return accuracy, classification_report(y_test, y_pred)
+        model.set_params(
+            warm_start=True,
+            n_estimators=len(model.estimators_) + refresh_estimators + additional_estimators,
+            random_state=seed,
+            class_weight=None,
+            n_jobs=self.n_jobs
+        )
+        self.params['n_estimators'] = model.n_estimators
+        self._registry_key = None
+        
+        return self._fit_and_evaluate(
+            model, encoder, X_train, X_test, y_train, y_test, _row_ids(self.df), self.trained_ids, timings,
+            sample_weight=compute_sample_weight('balanced', y_train)
+        )
     
-    def predict_attrition(self, employee_data):
-        if self.model is None:
-            raise ValueError("Model not trained. Call train_model() first.")
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = dataset_fingerprint(self.df)
+        return self._fingerprint
+    
+    def registry_key(self, registry):
+        if self._registry_key is None:
+            self._registry_key = registry.key(self.fingerprint(), self.params)
+        return self._registry_key
+    
+    def save(self, registry=None):
+        with self._lock:
+            if self.model is None:
+                raise ValueError("Model not trained. Call train_model() first.")
+            artifacts = {
+                'model': self.model,
+                'encoder': self.encoder,
+                'feature_importance': self.feature_importance,
+                'feature_cols': self.feature_cols,
+                'accuracy': self.accuracy,
+                'report': self.report,
+                'training_timings': self.training_timings,
+                'trained_ids': self.trained_ids,
+                'held_out_ids': self.held_out_ids
+            }
         
-        X, _, _ = self.prepare_data()
+        registry = registry or ModelRegistry()
+        return registry.save(self.registry_key(registry), artifacts)
+    
+    def publish(self, registry=None):
+        registry = registry or ModelRegistry()
+        path = self.save(registry)
+        registry.publish(self.fingerprint(), self.params)
+        return path
+    
+    def load(self, registry=None, published=True):
+        registry = registry or ModelRegistry()
+        if published:
+            params = registry.published_params(self.fingerprint())
+            if params is not None and params != self.params:
+                self.params = params
+                self._registry_key = None
+        
+        artifacts = registry.load(self.registry_key(registry))
+        if artifacts is None:
+            return False
         
-        for col, le in self.label_encoders.items():
-            if col in employee_data:
-                employee_data[col] = le.transform([str(employee_data[col])])[0]
+        self._swap({'training_timings': {}, 'trained_ids': None, 'held_out_ids': None, **artifacts})
+        return True
+    
+    @classmethod
+    def load_or_train(cls, df, registry=None, **params):
+        registry = registry or ModelRegistry()
+        predictor = cls(df, **params)
+        if not predictor.load(registry):
+            predictor.train_model()
+            predictor.save(registry)
+        return predictor
+    
+    @classmethod
+    def from_registry(cls, key, registry=None):
+        predictor = cls(None)
+        predictor._registry_key = key
+        if not predictor.load(registry, published=False):
+            raise ValueError(f"Model not found in registry: {key}")
+        return predictor
+    
+    @traced('AttritionPredictor.predict_batch')
+    def predict_batch(self, df, batch_size=config.PREDICTION_BATCH_SIZE):
+        model, encoder = self._fitted()
         
-        prediction = self.model.predict([list(employee_data.values())])[0]
-        probability = self.model.predict_proba([list(employee_data.values())])[0]
+        start = time.perf_counter()
+        X = encoder.transform(df)
         
+        positive = list(model.classes_).index(1)
+        probability = np.empty(len(X), dtype=np.float64)
+        for offset in range(0, len(X), batch_size):
+            chunk = X.iloc[offset:offset + batch_size]
+            probability[offset:offset + batch_size] = model.predict_proba(chunk)[:, positive]
+        
+        probability *= 100
+        results = pd.DataFrame({
+            'prediction': np.where(probability > 50, 'Yes', 'No'),
+            'probability': probability,
+            'risk_band': pd.cut(
+                probability,
+                bins=[-np.inf] + config.RISK_BAND_THRESHOLDS + [np.inf],
+                labels=config.RISK_BANDS
+            )
+        }, index=df.index)
+        
+        elapsed = time.perf_counter() - start
+        self.last_batch_throughput = len(X) / elapsed if elapsed > 0 else float('inf')
+        logger.info(f"Scored {len(X)} employees at {self.last_batch_throughput:,.0f} rows/second")
+        
+        return results
+    
+    def predict_attrition(self, employee_data):
+        result = self.predict_batch(pd.DataFrame([employee_data])).iloc[0]
         return {
-            'prediction': 'Yes' if prediction == 1 else 'No',
-            'probability': float(probability[1]) * 100
+            'prediction': result['prediction'],
+            'probability': float(result['probability']),
+            'risk_band': result['risk_band']
         }
     
     def get_feature_importance(self):
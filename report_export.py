@@ -0,0 +1,124 @@
+import argparse
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import logging
+import config
+from data_processor import DataProcessor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_worker_viz = None
+
+
+def _init_worker():
+    global _worker_viz
+    import matplotlib
+    matplotlib.use('Agg')
+    from visualizations import Visualizations
+    _worker_viz = Visualizations(figure_cache=None)
+
+
+def _render(method, args, target, formats, dpi):
+    import matplotlib.pyplot as plt
+
+    fig = getattr(_worker_viz, method)(*args)
+    paths = []
+    try:
+        for fmt in formats:
+            path = f"{target}.{fmt}"
+            fig.savefig(path, format=fmt, dpi=dpi, bbox_inches='tight')
+            paths.append(path)
+    finally:
+        plt.close(fig)
+    return paths
+
+
+def _slug(name):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(name)).strip('-').lower() or 'unnamed'
+
+
+def _scope_jobs(result, salary, directory, include_department_chart):
+    jobs = [('create_kpi_cards', (result.stats,), directory / 'kpi_cards')]
+    if include_department_chart:
+        jobs.append(('plot_department_attrition', (result.department_attrition,),
+                     directory / 'department_attrition'))
+    jobs.extend([
+        ('plot_gender_attrition', (result.gender_attrition, result.gender_attrition['total_employees']),
+         directory / 'gender_attrition'),
+        ('plot_technical_attrition', (result.technical_attrition, result.technical_attrition['total_employees']),
+         directory / 'technical_attrition'),
+        ('plot_salary_distribution', (salary,), directory / 'salary_distribution')
+    ])
+    return jobs
+
+
+def build_report_jobs(processor, output_dir, departments=None):
+    df = processor.df
+    output_dir = Path(output_dir)
+    jobs = _scope_jobs(processor.query(), df[['salary']], output_dir / 'overall', True)
+
+    if departments is None:
+        departments = list(processor.get_cube().breakdown('department').index)
+    codes, uniques = processor._column_codes('department')
+    for department in departments:
+        result = processor.query({'department': [department]})
+        if result.stats['total_employees'] == 0:
+            logger.warning(f"Skipping department without employees: {department}")
+            continue
+        mask = codes == uniques.get_loc(department)
+        salary = df.loc[mask, ['salary']]
+        directory = output_dir / 'departments' / _slug(department)
+        jobs.extend(_scope_jobs(result, salary, directory, False))
+    return jobs
+
+
+def export_report(processor, output_dir=config.REPORT_DIR, formats=None, departments=None,
+                  n_workers=None, dpi=config.CHART_STYLE['dpi']):
+    formats = list(formats or config.REPORT_FORMATS)
+    if processor.df is None:
+        processor.load_data()
+
+    start = time.perf_counter()
+    jobs = build_report_jobs(processor, output_dir, departments)
+    for _, _, target in jobs:
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker
+    ) as pool:
+        tasks = [pool.submit(_render, method, args, str(target), formats, dpi)
+                 for method, args, target in jobs]
+        paths = [path for task in tasks for path in task.result()]
+
+    logger.info(f"Exported {len(paths)} report files for {len(jobs)} figures to {output_dir} "
+                f"in {time.perf_counter() - start:.1f}s")
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the static HR analytics report pack")
+    parser.add_argument('--data', default=config.DATA_PATH, help="source CSV file")
+    parser.add_argument('--output-dir', default=config.REPORT_DIR)
+    parser.add_argument('--formats', nargs='+', default=config.REPORT_FORMATS,
+                        choices=['png', 'svg', 'pdf'])
+    parser.add_argument('--departments', nargs='*',
+                        help="departments to export variants for (default: all, none when given empty)")
+    parser.add_argument('--workers', type=int, help="number of rendering processes (default: CPU count)")
+    parser.add_argument('--dpi', type=int, default=config.CHART_STYLE['dpi'])
+    args = parser.parse_args(argv)
+
+    processor = DataProcessor(args.data)
+    if processor.load_data() is None:
+        raise SystemExit(f"Could not load {args.data}")
+    export_report(processor, args.output_dir, args.formats, args.departments, args.workers, args.dpi)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
-import subprocess
 import sys
 
 if __name__ == "__main__":
-    subprocess.run([sys.executable, "-m", "streamlit", "run", "app.py"])
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", "app.py", *sys.argv[1:]]
+    sys.exit(stcli.main())
@@ -0,0 +1,120 @@
+import pandas as pd
+import numpy as np
+import logging
+import config
+from data_processor import attrition_flag, build_attrition_table, update_sorted
+from tracing import traced
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _format_salary(value):
+    return f"{value / 1000:g}K"
+
+
+def band_labels(edges):
+    edges = list(edges)
+    if not edges:
+        return ['All']
+    labels = [f"Under {_format_salary(edges[0])}"]
+    labels.extend(f"{_format_salary(low)}-{_format_salary(high)}" for low, high in zip(edges[:-1], edges[1:]))
+    labels.append(f"Over {_format_salary(edges[-1])}")
+    return labels
+
+
+def _quantile_sorted(values, q):
+    q = np.asarray(q, dtype=np.float64)
+    if len(values) == 0:
+        return np.full(q.shape, np.nan)
+    position = q * (len(values) - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class SalaryIndex:
+    def __init__(self, salaries, flags):
+        self.salaries = salaries
+        self.flags = flags
+        self.leaver_prefix = np.concatenate([[0], np.cumsum(flags, dtype=np.int64)])
+        self.salary_prefix = np.concatenate([[0.0], np.cumsum(salaries)])
+
+        self.summary = {
+            'mean': self.salary_prefix[-1] / len(salaries) if len(salaries) else np.nan,
+            'median': float(_quantile_sorted(salaries, 0.5)),
+            'min': salaries[0] if len(salaries) else np.nan,
+            'max': salaries[-1] if len(salaries) else np.nan,
+            'std': salaries.std(ddof=1) if len(salaries) > 1 else np.nan
+        }
+
+        rows = {}
+        for label, selected in (('No', flags == 0), ('Yes', flags == 1)):
+            subset = salaries[selected]
+            if len(subset):
+                rows[label] = (subset.mean(), float(_quantile_sorted(subset, 0.5)), len(subset))
+        self.by_attrition = pd.DataFrame(
+            list(rows.values()), columns=['mean', 'median', 'count'],
+            index=pd.CategoricalIndex(list(rows), categories=['No', 'Yes'], name='attrition')
+        )
+
+    @classmethod
+    @traced('SalaryIndex.from_processor')
+    def from_processor(cls, processor):
+        salary = processor.df['salary'].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(salary)
+        order = np.argsort(salary[valid], kind='stable')
+        flags = processor._attrition_flag()[valid][order]
+        logger.info(f"Salary index built: {valid.sum()} salaries")
+        return cls(salary[valid][order], flags)
+
+    def apply_delta(self, removed, added):
+        def pairs(frame):
+            salary = frame['salary'].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(salary)
+            return salary[valid], attrition_flag(frame)[valid]
+
+        updated = update_sorted(self.salaries, self.flags, *pairs(removed), *pairs(added))
+        return None if updated is None else SalaryIndex(*updated)
+
+    def __len__(self):
+        return len(self.salaries)
+
+    def quantile(self, q):
+        result = _quantile_sorted(self.salaries, q)
+        return float(result) if np.ndim(result) == 0 else result
+
+    def _positions(self, low, high):
+        start = 0 if low is None else np.searchsorted(self.salaries, low, side='left')
+        stop = len(self.salaries) if high is None else np.searchsorted(self.salaries, high, side='left')
+        return start, np.maximum(stop, start)
+
+    def range_stats(self, low=None, high=None):
+        start, stop = self._positions(low, high)
+        total = int(stop - start)
+        leavers = int(self.leaver_prefix[stop] - self.leaver_prefix[start])
+        return {
+            'total_employees': total,
+            'employees_left': leavers,
+            'attrition_rate': leavers / total * 100 if total else np.nan,
+            'average_salary': float(self.salary_prefix[stop] - self.salary_prefix[start]) / total if total else np.nan
+        }
+
+    def band_stats(self, edges=None, labels=None):
+        edges = np.sort(np.asarray(config.SALARY_BAND_EDGES if edges is None else edges, dtype=np.float64))
+        labels = list(labels) if labels is not None else band_labels(edges)
+        if len(labels) != len(edges) + 1:
+            raise ValueError(f"Expected {len(edges) + 1} band labels, got {len(labels)}")
+
+        cuts = np.concatenate([[0], np.searchsorted(self.salaries, edges, side='left'), [len(self.salaries)]])
+        totals = np.diff(cuts)
+        leavers = np.diff(self.leaver_prefix[cuts])
+        salary_sums = np.diff(self.salary_prefix[cuts])
+
+        present = np.flatnonzero(totals)
+        table = build_attrition_table(
+            pd.Index(np.asarray(labels, dtype=object)[present], name='salary_range'),
+            totals[present], leavers[present]
+        )
+        table['avg_salary_in_range'] = np.round(salary_sums[present] / totals[present], 0)
+        return table
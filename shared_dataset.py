@@ -0,0 +1,248 @@
+import pandas as pd
+import numpy as np
+import errno
+import hashlib
+import json
+import mmap
+import os
+import struct
+from multiprocessing import shared_memory
+from pathlib import Path
+import logging
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import _posixshmem
+except ImportError:
+    _posixshmem = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ALIGNMENT = 64
+_HEADER_SIZE = struct.Struct('<Q')
+_SHM_DIR = Path('/dev/shm')
+
+
+class _UntrackedSegment:
+    def __init__(self, name, create=False, size=0):
+        flags = os.O_RDWR | (os.O_CREAT | os.O_EXCL if create else 0)
+        fd = _posixshmem.shm_open(f"/{name}", flags, mode=0o600)
+        try:
+            if create:
+                os.ftruncate(fd, size)
+            self.size = os.fstat(fd).st_size
+            self._mmap = mmap.mmap(fd, self.size)
+        except BaseException:
+            if create:
+                _posixshmem.shm_unlink(f"/{name}")
+            raise
+        finally:
+            os.close(fd)
+        self.name = name
+        self.buf = memoryview(self._mmap)
+
+    def unlink(self):
+        _posixshmem.shm_unlink(f"/{self.name}")
+
+
+def _open(name, create=False, size=0):
+    if _posixshmem is None:
+        return shared_memory.SharedMemory(name, create=create, size=size)
+    return _UntrackedSegment(name, create=create, size=size)
+
+
+def _unlink(name):
+    try:
+        if _posixshmem is None:
+            shared_memory.SharedMemory(name).unlink()
+        else:
+            _posixshmem.shm_unlink(f"/{name}")
+    except FileNotFoundError:
+        pass
+
+
+def _check_capacity(size):
+    if not _SHM_DIR.is_dir():
+        return
+    stats = os.statvfs(_SHM_DIR)
+    available = stats.f_bavail * stats.f_frsize
+    if size > available:
+        raise OSError(
+            errno.ENOSPC,
+            f"Shared memory needs {size / 1e6:.1f} MB but {_SHM_DIR} has {available / 1e6:.1f} MB free"
+        )
+
+
+def _address(shm):
+    return np.frombuffer(shm.buf, dtype=np.uint8).ctypes.data
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class _SharedArray:
+    def __init__(self, shm, address, dtype, length):
+        self.shm = shm
+        self.__array_interface__ = {
+            'data': (address, True),
+            'shape': (length,),
+            'typestr': np.dtype(dtype).str,
+            'version': 3
+        }
+
+
+def _column_buffers(series):
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return {
+            'kind': 'category',
+            'categories': dtype.categories.tolist(),
+            'ordered': bool(dtype.ordered)
+        }, [np.ascontiguousarray(series.cat.codes.to_numpy())]
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufmM':
+        return {'kind': 'array'}, [np.ascontiguousarray(series.to_numpy())]
+    if pa is not None and (isinstance(dtype, pd.StringDtype) or (
+            dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'))):
+        values = pa.array(series, type=pa.large_string(), from_pandas=True)
+        buffers = [np.frombuffer(buffer, dtype=np.uint8) if buffer is not None else None
+                   for buffer in values.buffers()]
+        return {
+            'kind': 'string',
+            'null_count': values.null_count,
+            'na_value': None if isinstance(dtype, pd.StringDtype) and dtype.na_value is pd.NA else 'nan'
+        }, buffers
+    raise ValueError(f"Column {series.name} of dtype {dtype} cannot be placed in shared memory")
+
+
+def _column_frame(spec, arrays, length):
+    if spec['kind'] == 'category':
+        return pd.Categorical.from_codes(
+            arrays[0], pd.Index(spec['categories']), ordered=spec['ordered'], validate=False
+        )
+    if spec['kind'] == 'array':
+        return arrays[0]
+
+    buffers = [None if array is None else pa.py_buffer(array) for array in arrays]
+    values = pa.Array.from_buffers(pa.large_string(), length, buffers, spec['null_count'])
+    dtype = pd.StringDtype('pyarrow', na_value=pd.NA if spec['na_value'] is None else np.nan)
+    return dtype.construct_array_type()(pa.chunked_array([values]), dtype=dtype)
+
+
+class SharedSnapshot:
+    def __init__(self, frame, generation, metadata):
+        self.frame = frame
+        self.generation = generation
+        self.metadata = metadata
+
+
+class SharedDataset:
+    def __init__(self, name):
+        self.name = name
+        self._manifest = None
+
+    @classmethod
+    def for_source(cls, data_path, variant):
+        key = f"{Path(data_path).resolve()}|{variant}"
+        return cls(f"hr{hashlib.sha1(key.encode()).hexdigest()[:12]}")
+
+    def _snapshot_name(self, generation):
+        return f"{self.name}.{generation}"
+
+    def _counter(self):
+        if self._manifest is None:
+            try:
+                self._manifest = _open(self.name, create=True, size=8)
+            except FileExistsError:
+                self._manifest = _open(self.name)
+        return np.ndarray((1,), dtype=np.int64, buffer=self._manifest.buf)
+
+    def generation(self):
+        return int(self._counter()[0])
+
+    def publish(self, df, metadata=None):
+        columns, payload = [], []
+        offset = 0
+        for col in df.columns:
+            spec, arrays = _column_buffers(df[col])
+            spec['name'] = col
+            spec['dtype'] = str(df[col].dtype)
+            spec['buffers'] = []
+            for array in arrays:
+                if array is None:
+                    spec['buffers'].append(None)
+                    continue
+                spec['buffers'].append({'offset': offset, 'dtype': array.dtype.str, 'length': len(array)})
+                payload.append((offset, array))
+                offset = _aligned(offset + array.nbytes)
+            columns.append(spec)
+
+        header = json.dumps({'rows': len(df), 'columns': columns, 'metadata': metadata or {}}).encode()
+        data_start = _aligned(_HEADER_SIZE.size + len(header))
+        size = max(data_start + offset, 1)
+        _check_capacity(size)
+
+        counter = self._counter()
+        previous = int(counter[0])
+        generation = previous + 1
+        while True:
+            try:
+                shm = _open(self._snapshot_name(generation), create=True, size=size)
+                break
+            except FileExistsError:
+                generation += 1
+
+        _HEADER_SIZE.pack_into(shm.buf, 0, len(header))
+        shm.buf[_HEADER_SIZE.size:_HEADER_SIZE.size + len(header)] = header
+        block = np.frombuffer(shm.buf, dtype=np.uint8)
+        for start, array in payload:
+            block[data_start + start:data_start + start + array.nbytes] = array.view(np.uint8)
+        del block
+
+        if counter[0] < generation:
+            counter[0] = generation
+        del counter
+
+        if previous:
+            _unlink(self._snapshot_name(previous))
+        logger.info(
+            f"Published dataset generation {generation} to shared memory {shm.name}: "
+            f"{len(df)} rows, {shm.size / 1e6:.1f} MB"
+        )
+        return generation
+
+    def attach(self, generation=None):
+        generation = self.generation() if generation is None else generation
+        if generation == 0:
+            return None
+
+        shm = _open(self._snapshot_name(generation))
+        (header_length,) = _HEADER_SIZE.unpack_from(shm.buf, 0)
+        header = json.loads(bytes(shm.buf[_HEADER_SIZE.size:_HEADER_SIZE.size + header_length]))
+        address = _address(shm) + _aligned(_HEADER_SIZE.size + header_length)
+
+        data = {}
+        for spec in header['columns']:
+            arrays = [
+                None if buffer is None else np.asarray(_SharedArray(
+                    shm, address + buffer['offset'], buffer['dtype'], buffer['length']
+                ))
+                for buffer in spec['buffers']
+            ]
+            data[spec['name']] = _column_frame(spec, arrays, header['rows'])
+        frame = pd.DataFrame(data, copy=False)
+        return SharedSnapshot(frame, generation, header['metadata'])
+
+    def unlink(self):
+        if self._manifest is None:
+            self._counter()
+        generation = self.generation()
+        if generation:
+            _unlink(self._snapshot_name(generation))
+        _unlink(self.name)
+        self._manifest = None
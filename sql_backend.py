@@ -0,0 +1,227 @@
+import pandas as pd
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+import logging
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = 'hr_analytics_data'
+
+AVERAGES_SQL = f"SELECT AVG(age) AS average_age, AVG(salary) AS average_salary FROM {TABLE_NAME}"
+
+MEDIAN_SQL = f"""
+SELECT AVG(salary) FROM (
+    SELECT salary FROM {TABLE_NAME} WHERE {{where}}
+    ORDER BY salary
+    LIMIT 2 - (SELECT COUNT(*) FROM {TABLE_NAME} WHERE {{where}}) % 2
+    OFFSET (
+        (SELECT COUNT(*) FROM {TABLE_NAME} WHERE {{where}}) - 1
+        - ((SELECT COUNT(*) FROM {TABLE_NAME} WHERE {{where}}) - 1) % 2
+    ) / 2
+)
+"""
+
+
+def load_query_pack(sql_dir=config.SQL_DIR):
+    pack = {}
+    for path in sorted(Path(sql_dir).glob('*.sql')):
+        text = re.sub(r'--[^\n]*', '', path.read_text())
+        statements = [statement.strip() for statement in text.split(';')]
+        pack[path.stem] = [statement for statement in statements if statement]
+    return pack
+
+
+def source_signature(data_path):
+    stat = Path(data_path).resolve().stat()
+    key = f"{Path(data_path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class _SampleStddev:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def step(self, value):
+        if value is None:
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def finalize(self):
+        if self.count < 2:
+            return None
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class SQLBackend(ABC):
+    name = None
+
+    def __init__(self, db_path, sql_dir=config.SQL_DIR):
+        self.db_path = db_path
+        self.queries = load_query_pack(sql_dir)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _connect(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def _load_csv(self, data_path):
+        raise NotImplementedError
+
+    def _execute_script(self, statements):
+        for statement in statements:
+            self._conn.execute(statement)
+
+    def execute(self, sql, params=None):
+        with self._lock:
+            return self._read_sql(sql, params or [])
+
+    def _read_sql(self, sql, params):
+        cursor = self._conn.execute(sql, params)
+        columns = [description[0] for description in cursor.description]
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+    def attach(self, data_path):
+        signature = source_signature(data_path)
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+
+            self._conn.execute("CREATE TABLE IF NOT EXISTS _source_meta (signature VARCHAR)")
+            current = self._conn.execute("SELECT signature FROM _source_meta").fetchall()
+            if current and current[0][0] == signature:
+                return self
+
+            self._conn.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+            self._execute_script(self.queries['00_database_setup'])
+            self._load_csv(data_path)
+            self._conn.execute("DELETE FROM _source_meta")
+            self._conn.execute("INSERT INTO _source_meta VALUES (?)", [signature])
+            self._conn.commit()
+
+        logger.info(f"Loaded {data_path} into {self.name} database {self.db_path}")
+        return self
+
+    def run_query(self, name, index=0):
+        return self.execute(self.queries[name][index])
+
+    def _attrition_table(self, result, dimension):
+        table = result.set_index(dimension).rename(
+            columns={'attrition_rate_percentage': 'attrition_rate'}
+        )
+        return table[['total_employees', 'employees_left', 'attrition_rate']]
+
+    def get_basic_stats(self):
+        overview = self.run_query('01_attrition_overview').iloc[0]
+        averages = self.execute(AVERAGES_SQL).iloc[0]
+        return {
+            'total_employees': int(overview['total_employees']),
+            'attrition_rate': overview['employees_left'] / overview['total_employees'] * 100,
+            'average_age': float(averages['average_age']),
+            'average_salary': float(averages['average_salary'])
+        }
+
+    def get_department_attrition(self):
+        return self._attrition_table(self.run_query('02_department_attrition'), 'department')
+
+    def get_gender_attrition(self):
+        return self._attrition_table(self.run_query('04_gender_attrition'), 'gender').sort_index()
+
+    def get_technical_attrition(self):
+        result = self.run_query('03_technical_background_attrition')
+        return self._attrition_table(result, 'technical_background').sort_index()
+
+    def get_performance_analysis(self):
+        return self._attrition_table(self.run_query('06_advanced_analytics', 0), 'performance_rating')
+
+    def get_worklife_balance_analysis(self):
+        return self._attrition_table(self.run_query('06_advanced_analytics', 1), 'work_life_balance')
+
+    def _median_salary(self, where='1 = 1', params=None):
+        params = list(params or [])
+        return float(self.execute(MEDIAN_SQL.format(where=where), params * 4).iloc[0, 0])
+
+    def get_salary_analysis(self):
+        overview = self.run_query('01_attrition_overview').iloc[0]
+        averages = self.execute(AVERAGES_SQL).iloc[0]
+        salary_stats = {
+            'mean': float(averages['average_salary']),
+            'median': float(self._median_salary()),
+            'min': float(overview['min_salary']),
+            'max': float(overview['max_salary']),
+            'std': float(overview['salary_stddev'])
+        }
+
+        salary_by_attrition = self.execute(
+            f"SELECT attrition, AVG(salary) AS mean, COUNT(*) AS count "
+            f"FROM {TABLE_NAME} GROUP BY attrition ORDER BY attrition"
+        ).set_index('attrition')
+        salary_by_attrition.insert(1, 'median', [
+            self._median_salary('attrition = ?', [value]) for value in salary_by_attrition.index
+        ])
+
+        return salary_stats, salary_by_attrition
+
+
+class SQLiteBackend(SQLBackend):
+    name = 'sqlite'
+
+    def __init__(self, db_path=config.SQLITE_DATABASE_PATH, sql_dir=config.SQL_DIR):
+        super().__init__(db_path, sql_dir)
+
+    def _connect(self):
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.create_aggregate('STDDEV', 1, _SampleStddev)
+        return conn
+
+    def _load_csv(self, data_path):
+        for chunk in pd.read_csv(data_path, chunksize=config.STREAM_CHUNK_SIZE):
+            chunk.to_sql(TABLE_NAME, self._conn, if_exists='append', index=False)
+
+
+class DuckDBBackend(SQLBackend):
+    name = 'duckdb'
+
+    def __init__(self, db_path=config.DUCKDB_DATABASE_PATH, sql_dir=config.SQL_DIR):
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("duckdb is required for the DuckDB backend")
+        self._duckdb = duckdb
+        super().__init__(db_path, sql_dir)
+
+    def _connect(self):
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        return self._duckdb.connect(str(self.db_path))
+
+    def _load_csv(self, data_path):
+        source = str(Path(data_path).resolve()).replace("'", "''")
+        self._conn.execute(
+            f"INSERT INTO {TABLE_NAME} SELECT * FROM read_csv_auto('{source}', header = true)"
+        )
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'duckdb': DuckDBBackend
+}
+
+
+def create_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name}")
+    return BACKENDS[name]()
@@ -0,0 +1,305 @@
+import math
+import pandas as pd
+import numpy as np
+import logging
+import config
+from data_processor import build_attrition_table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BREAKDOWN_DIMENSIONS = [
+    'department',
+    'gender',
+    'technical_background',
+    'performance_rating',
+    'work_life_balance'
+]
+
+STREAM_COLUMNS = ['employee_id', 'attrition', 'age', 'salary'] + BREAKDOWN_DIMENSIONS
+
+
+class KLLSketch:
+    # Mergeable quantile sketch (Karnin, Lang & Liberty, 2016). Level h holds
+    # items of weight 2**h; a full level is sorted and every other item is
+    # promoted. With k=200 the normalized rank error of a quantile query is
+    # about 1.65% with 99% confidence, independent of the stream length, and
+    # memory stays O(k) items. Results are exact until the first compaction.
+    def __init__(self, k=config.QUANTILE_SKETCH_K, seed=None):
+        self.k = k
+        self.count = 0
+        self.levels = []
+        self._rng = np.random.default_rng(seed)
+        self._grow()
+
+    def _grow(self):
+        self.levels.append(np.empty(0, dtype=np.float64))
+        self.max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return int(math.ceil((2 / 3) ** depth * self.k)) + 1
+
+    def _size(self):
+        return sum(len(items) for items in self.levels)
+
+    def _compress(self):
+        while self._size() >= self.max_size:
+            for h, items in enumerate(self.levels):
+                if len(items) < self._capacity(h):
+                    continue
+
+                if h + 1 >= len(self.levels):
+                    self._grow()
+
+                items = np.sort(items)
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                promoted = paired[self._rng.integers(2)::2]
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                break
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += len(values)
+        self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self._grow()
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return np.nan
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level), 2 ** h, dtype=np.int64) for h, level in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind='mergesort')
+        items, weights = items[order], weights[order]
+
+        cumulative = np.cumsum(weights)
+        target = q * cumulative[-1]
+        lower = items[min(np.searchsorted(cumulative, target, side='left'), len(items) - 1)]
+        upper = items[min(np.searchsorted(cumulative, target, side='right'), len(items) - 1)]
+        if target == math.floor(target) and 0 < q < 1:
+            return (lower + upper) / 2
+        return lower
+
+
+class MomentAccumulator:
+    # Count, mean and M2 merged with Chan's parallel update, which carries the
+    # same information as running sums and sums of squares without the
+    # cancellation error of sum(x**2) - n * mean**2 on large salary totals.
+    def __init__(self, with_sketch=False):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = KLLSketch() if with_sketch else None
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        other = MomentAccumulator()
+        other.count = len(values)
+        other.mean = values.mean()
+        other.m2 = ((values - other.mean) ** 2).sum()
+        other.min = values.min()
+        other.max = values.max()
+        self._combine(other)
+
+        if self.sketch is not None:
+            self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        self._combine(other)
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        return self
+
+    def _combine(self, other):
+        if other.count == 0:
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def std(self):
+        if self.count < 2:
+            return np.nan
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def median(self):
+        if self.sketch is None:
+            return np.nan
+        return self.sketch.quantile(0.5)
+
+
+class StreamingAggregates:
+    def __init__(self, dimensions=None):
+        self.dimensions = list(dimensions or BREAKDOWN_DIMENSIONS)
+        self.total_employees = 0
+        self.employees_left = 0
+        self.age = MomentAccumulator()
+        self.salary = MomentAccumulator(with_sketch=True)
+        self.salary_by_attrition = {}
+        self.breakdowns = {}
+
+    def update(self, chunk):
+        flag = (chunk['attrition'] == 'Yes').to_numpy()
+
+        self.total_employees += len(chunk)
+        self.employees_left += int(flag.sum())
+        self.age.update(chunk['age'])
+        self.salary.update(chunk['salary'])
+
+        for value, salaries in chunk.groupby('attrition', observed=True)['salary']:
+            accumulator = self.salary_by_attrition.setdefault(
+                value, MomentAccumulator(with_sketch=True)
+            )
+            accumulator.update(salaries)
+
+        counts = pd.DataFrame({
+            'total_employees': np.ones(len(chunk), dtype=np.int64),
+            'employees_left': flag.astype(np.int64)
+        }, index=chunk.index)
+        for dim in self.dimensions:
+            if dim not in chunk.columns:
+                continue
+            partial = counts.groupby(chunk[dim].to_numpy()).sum()
+            if dim in self.breakdowns:
+                partial = self.breakdowns[dim].add(partial, fill_value=0).astype(np.int64)
+            self.breakdowns[dim] = partial
+
+        return self
+
+    def merge(self, other):
+        self.total_employees += other.total_employees
+        self.employees_left += other.employees_left
+        self.age.merge(other.age)
+        self.salary.merge(other.salary)
+
+        for value, accumulator in other.salary_by_attrition.items():
+            if value in self.salary_by_attrition:
+                self.salary_by_attrition[value].merge(accumulator)
+            else:
+                self.salary_by_attrition[value] = accumulator
+
+        for dim, partial in other.breakdowns.items():
+            if dim in self.breakdowns:
+                partial = self.breakdowns[dim].add(partial, fill_value=0).astype(np.int64)
+            self.breakdowns[dim] = partial
+
+        return self
+
+    def breakdown(self, dimension):
+        if dimension not in self.breakdowns:
+            return None
+
+        partial = self.breakdowns[dimension].sort_index()
+        index = partial.index.rename(dimension)
+        return build_attrition_table(
+            index,
+            partial['total_employees'].to_numpy(),
+            partial['employees_left'].to_numpy()
+        )
+
+
+class StreamingDataProcessor:
+    def __init__(self, data_path=config.DATA_PATH, chunksize=config.STREAM_CHUNK_SIZE):
+        self.data_path = data_path
+        self.chunksize = chunksize
+        self.aggregates = None
+
+    def iter_chunks(self):
+        header = pd.read_csv(self.data_path, nrows=0).columns
+        columns = [col for col in STREAM_COLUMNS if col in header]
+        return pd.read_csv(self.data_path, usecols=columns, chunksize=self.chunksize)
+
+    def aggregate(self, chunks=None):
+        aggregates = StreamingAggregates()
+        rows = 0
+        for chunk in (chunks if chunks is not None else self.iter_chunks()):
+            aggregates.update(chunk)
+            rows += len(chunk)
+
+        if rows == 0:
+            raise ValueError("Dataset is empty")
+
+        logger.info(f"Streamed {rows} records in chunks of {self.chunksize}")
+        self.aggregates = aggregates
+        return aggregates
+
+    def _require_aggregates(self):
+        if self.aggregates is None:
+            self.aggregate()
+        return self.aggregates
+
+    def get_basic_stats(self):
+        agg = self._require_aggregates()
+        return {
+            'total_employees': agg.total_employees,
+            'attrition_rate': agg.employees_left / agg.total_employees * 100,
+            'average_age': agg.age.mean,
+            'average_salary': agg.salary.mean
+        }
+
+    def get_department_attrition(self):
+        dept_attrition = self._require_aggregates().breakdown('department')
+        return dept_attrition.sort_values('attrition_rate', ascending=False)
+
+    def get_gender_attrition(self):
+        return self._require_aggregates().breakdown('gender')
+
+    def get_technical_attrition(self):
+        return self._require_aggregates().breakdown('technical_background')
+
+    def get_performance_analysis(self):
+        return self._require_aggregates().breakdown('performance_rating')
+
+    def get_worklife_balance_analysis(self):
+        return self._require_aggregates().breakdown('work_life_balance')
+
+    def get_salary_analysis(self):
+        agg = self._require_aggregates()
+        salary_stats = {
+            'mean': agg.salary.mean,
+            'median': agg.salary.median(),
+            'min': agg.salary.min,
+            'max': agg.salary.max,
+            'std': agg.salary.std()
+        }
+
+        salary_by_attrition = pd.DataFrame(
+            [
+                {'mean': acc.mean, 'median': acc.median(), 'count': acc.count}
+                for acc in agg.salary_by_attrition.values()
+            ],
+            index=pd.Index(list(agg.salary_by_attrition.keys()), name='attrition')
+        ).sort_index()
+
+        return salary_stats, salary_by_attrition
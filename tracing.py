@@ -0,0 +1,145 @@
+import contextvars
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import logging
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+
+def _rss_bytes():
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return None
+
+
+def _infer_rows(args, result):
+    if args:
+        df = getattr(args[0], 'df', None)
+        if df is not None:
+            return len(df)
+    if hasattr(result, '__len__') and not isinstance(result, (str, dict, tuple)):
+        return len(result)
+    return None
+
+
+class Trace:
+    def __init__(self, name):
+        self.name = name
+        self.started_at = time.time()
+        self.stages = []
+        self._depth = 0
+
+    def record(self, stage, seconds, rows, memory_delta, depth):
+        self.stages.append({
+            'stage': stage,
+            'depth': depth,
+            'seconds': seconds,
+            'rows': rows,
+            'memory_delta_mb': None if memory_delta is None else memory_delta / 2 ** 20
+        })
+
+    def total_seconds(self):
+        return sum(stage['seconds'] for stage in self.stages if stage['depth'] == 0)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'started_at': self.started_at,
+            'total_seconds': self.total_seconds(),
+            'stages': self.stages
+        }
+
+    def dump(self, directory=config.TRACE_DIR):
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))
+        target = path / f"trace-{self.name}-{stamp}-{os.getpid()}-{id(self):x}.json"
+        target.write_text(json.dumps(self.to_dict(), indent=2))
+        return target
+
+
+def start_trace(name):
+    trace = Trace(name)
+    _current_trace.set(trace)
+    return trace
+
+
+def stop_trace():
+    trace = _current_trace.get()
+    _current_trace.set(None)
+    return trace
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_stage(stage, rows=None):
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    depth = trace._depth
+    trace._depth += 1
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        elapsed = time.perf_counter() - start
+        rss_after = _rss_bytes()
+        trace._depth = depth
+        memory_delta = None if rss_before is None or rss_after is None else rss_after - rss_before
+        trace.record(stage, elapsed, rows, memory_delta, depth)
+
+
+def traced(stage=None):
+    def decorator(func):
+        name = stage or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+
+            depth = trace._depth
+            trace._depth += 1
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                rss_after = _rss_bytes()
+                trace._depth = depth
+                memory_delta = None if rss_before is None or rss_after is None else rss_after - rss_before
+                trace.record(name, elapsed, _infer_rows(args, result), memory_delta, depth)
+
+        return wrapper
+
+    if callable(stage):
+        func, stage = stage, None
+        return decorator(func)
+    return decorator
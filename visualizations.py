@@ -1,19 +1,38 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
+import numpy as np
 import config
+from figure_cache import cached_figure, shared_figure_cache
+from tracing import traced
+
+_pyplot = None
+
+
+def pyplot():
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        sns.set_style("whitegrid")
+        plt.style.use(config.CHART_STYLE["style"])
+        _pyplot = plt
+    return _pyplot
+
+
+def _dashboard_key_inputs(df, *args, **kwargs):
+    columns = [col for col in ['salary', 'age', 'performance_rating'] if col in df.columns]
+    return (df[columns],) + args
 
-sns.set_style("whitegrid")
-plt.style.use(config.CHART_STYLE["style"])
 
 class Visualizations:
-    def __init__(self):
+    def __init__(self, figure_cache=shared_figure_cache):
         self.colors = config.COLORS
+        self.figure_cache = figure_cache
     
+    @traced('Visualizations.create_kpi_cards')
+    @cached_figure('Visualizations.create_kpi_cards')
     def create_kpi_cards(self, stats):
+        plt = pyplot()
         fig, axes = plt.subplots(1, 4, figsize=(20, 6))
         fig.suptitle('Key Performance Indicators', fontsize=16, fontweight='bold')
         
@@ -36,7 +55,10 @@ class Visualizations:
         plt.tight_layout()
         return fig
     
+    @traced('Visualizations.plot_department_attrition')
+    @cached_figure('Visualizations.plot_department_attrition')
     def plot_department_attrition(self, dept_data):
+        plt = pyplot()
         fig, ax = plt.subplots(figsize=(12, 8))
         
         dept_data_sorted = dept_data.sort_values('attrition_rate', ascending=True)
@@ -55,7 +77,10 @@ class Visualizations:
         plt.tight_layout()
         return fig
     
+    @traced('Visualizations.plot_gender_attrition')
+    @cached_figure('Visualizations.plot_gender_attrition')
     def plot_gender_attrition(self, gender_data, gender_dist):
+        plt = pyplot()
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         
         colors = ['#ff9999', '#66b3ff']
@@ -76,7 +101,10 @@ class Visualizations:
         plt.tight_layout()
         return fig
     
+    @traced('Visualizations.plot_technical_attrition')
+    @cached_figure('Visualizations.plot_technical_attrition')
     def plot_technical_attrition(self, tech_data, tech_dist):
+        plt = pyplot()
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         
         colors = ['#ff9999', '#66b3ff']
@@ -97,7 +125,10 @@ class Visualizations:
         plt.tight_layout()
         return fig
     
+    @traced('Visualizations.plot_salary_distribution')
+    @cached_figure('Visualizations.plot_salary_distribution', key_inputs=lambda df: (df['salary'],))
     def plot_salary_distribution(self, df):
+        plt = pyplot()
         fig, ax = plt.subplots(figsize=(12, 6))
         
         ax.hist(df['salary'], bins=20, color=self.colors['success'], alpha=0.7, edgecolor='black')
@@ -114,15 +145,32 @@ class Visualizations:
         plt.tight_layout()
         return fig
     
-    def create_interactive_dashboard(self, df, stats, dept_data, gender_data, tech_data):
+    def _histogram_bar(self, counts, edges, name, color):
+        import plotly.graph_objects as go
+        
+        return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                      name=name, marker_color=color)
+    
+    @traced('Visualizations.create_interactive_dashboard')
+    @cached_figure('Visualizations.create_interactive_dashboard', key_inputs=_dashboard_key_inputs)
+    def create_interactive_dashboard(self, df, stats, dept_data, gender_data, tech_data, histograms=None):
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
+        histograms = dict(histograms or {})
+        for column in ['salary', 'age']:
+            if column not in histograms:
+                values = df[column].dropna().to_numpy(dtype=np.float64)
+                histograms[column] = np.histogram(values, bins=config.HISTOGRAM_BINS[column])
+        
         fig = make_subplots(
             rows=3, cols=2,
             subplot_titles=('Department Attrition Rate', 'Gender Attrition Comparison',
                           'Technical Background Attrition', 'Salary Distribution',
                           'Age Distribution', 'Performance Rating Distribution'),
             specs=[[{"type": "bar"}, {"type": "bar"}],
-                   [{"type": "bar"}, {"type": "histogram"}],
-                   [{"type": "histogram"}, {"type": "bar"}]]
+                   [{"type": "bar"}, {"type": "bar"}],
+                   [{"type": "bar"}, {"type": "bar"}]]
         )
         
         dept_data_sorted = dept_data.sort_values('attrition_rate', ascending=True)
@@ -145,14 +193,12 @@ class Visualizations:
         )
         
         fig.add_trace(
-            go.Histogram(x=df['salary'], nbinsx=20, name='Salary',
-                        marker_color=self.colors['success']),
+            self._histogram_bar(*histograms['salary'], name='Salary', color=self.colors['success']),
             row=2, col=2
         )
         
         fig.add_trace(
-            go.Histogram(x=df['age'], nbinsx=15, name='Age',
-                        marker_color=self.colors['warning']),
+            self._histogram_bar(*histograms['age'], name='Age', color=self.colors['warning']),
             row=3, col=1
         )
         